@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+startup.py - Startup-time benchmark for build.py.
+
+Runs each lightweight build.py command several times in a fresh interpreter
+and reports the median wall time. The build runs with bytecode caching on
+(PYTHONDONTWRITEBYTECODE is dropped), as it does for a normal checkout, and
+a warm-up run fills __pycache__ before timing. Fails (exit 1) if `build.py help`
+takes more than STARTUP_BUDGET_MS above the `python -c pass` floor, or if a
+command imports one of LAZY_MODULES that it does not need.
+
+Usage:
+    python benchmarks/startup.py [--runs N]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from site_build import LAZY_MODULES, STARTUP_BUDGET_MS  # noqa: E402
+
+ENV = {key: value for key, value in os.environ.items() if key != 'PYTHONDONTWRITEBYTECODE'}
+
+# Lightweight commands (dry-run where they write) and the LAZY_MODULES they
+# need: fuzzy placeholder matching and dry-run reports use difflib, and the
+# pages pass runs on a thread pool
+COMMANDS = [
+    (['help'], ()),
+    (['images'], ()),
+    (['check'], ('difflib',)),
+    (['sw', '--dry-run'], ('difflib',)),
+    (['pages', '--dry-run'], ('difflib', 'concurrent.futures')),
+]
+
+def time_command(args, runs):
+    times = []
+    subprocess.run(args, cwd=SCRIPT_DIR, env=ENV, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(args, cwd=SCRIPT_DIR, env=ENV, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def imported_modules(command):
+    result = subprocess.run([sys.executable, '-X', 'importtime', 'build.py', *command],
+                            cwd=SCRIPT_DIR, env=ENV, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    return {line.rsplit('|', 1)[-1].strip() for line in result.stderr.splitlines() if '|' in line}
+
+def main():
+    runs = int(sys.argv[sys.argv.index('--runs') + 1]) if '--runs' in sys.argv else 10
+    failures = []
+    
+    baseline = time_command([sys.executable, '-c', 'pass'], runs)
+    print(f"{'python -c pass':28} {baseline:7.1f} ms  (interpreter floor)")
+    
+    for command, needed in COMMANDS:
+        median = time_command([sys.executable, 'build.py', *command], runs)
+        print(f"{'build.py ' + ' '.join(command):28} {median:7.1f} ms  (+{median - baseline:.1f} ms)")
+        if command == ['help'] and median - baseline > STARTUP_BUDGET_MS:
+            failures.append(f"build.py help took {median - baseline:.1f} ms above the interpreter floor "
+                            f"(budget {STARTUP_BUDGET_MS} ms)")
+        eager = sorted(m for m in imported_modules(command) if m in LAZY_MODULES and m not in needed)
+        if eager:
+            failures.append(f"build.py {' '.join(command)} imported {', '.join(eager)}")
+    
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -30,6 +30,20 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     });
 
+    // Nav card images are written as data-bg by build.py so they don't compete
+    // with the page's hero image; load them the first time a menu is opened
+    document.querySelectorAll('.nav-item').forEach(item => {
+        const loadCardImages = () => {
+            item.querySelectorAll('.card-image[data-bg]').forEach(card => {
+                card.style.backgroundImage = `url('${card.dataset.bg}')`;
+                card.removeAttribute('data-bg');
+            });
+        };
+        ['mouseenter', 'focusin', 'touchstart'].forEach(type => {
+            item.addEventListener(type, loadCardImages, { once: true, passive: true });
+        });
+    });
+
     const header = document.querySelector('header');
 
     let isScrolling;
@@ -0,0 +1,2826 @@
+#!/usr/bin/env python3
+"""
+site_build.py - Combined build script for Fringe Metrology website (run as build.py).
+
+This script performs three main functions:
+1. Builds the blog:
+   - Converts Markdown posts from blog/posts/ to HTML files in the root directory.
+   - Updates blog.html with the list of posts.
+2. Updates placeholders and common elements:
+   - Catalogs imgs/ (cached in .build_cache/ by directory mtime).
+   - Scans HTML files for image-placeholder divs and updates them.
+   - Updates headers and footers to standard templates.
+   - Updates the partners section in index.html.
+   - Injects preload hints for each page's hero image and key fonts.
+   - Renders the autocollimator canvases to inline SVG posters (POSTER markers).
+   With --stream (and always for very large pages) HTML files are processed
+   in fixed-size chunks so memory use does not grow with page size.
+3. Generates sw.js, a service worker with a content-hashed precache manifest
+   of the pages, stylesheet, scripts and header images.
+
+Usage:
+    python build.py [build] [--dry-run | --diff] [--skip-common] [--stream]
+    python build.py [build] [options] <target>...    rebuild targets and their dependents
+    python build.py [build] [options] --since <rev>  rebuild what changed since a git revision
+    python build.py blog | pages | images | sw | check [options]
+    python build.py serve [--port N]                 run the build daemon (local HTTP API)
+
+--dry-run runs the whole pipeline against an in-memory copy of the outputs
+and lists the files that would change; --diff also prints unified diffs.
+
+Targets are site-relative paths (fringescan.html, imgs/chips.png,
+blog/posts/foo.md) or partial:header / partial:footer. Targeted builds use
+the dependency graph recorded by the previous build in .build_cache/.
+"""
+
+import os
+import glob
+import datetime
+import hashlib
+import io
+import contextlib
+import json
+import math
+import re
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Heavier modules (markdown, yaml, difflib, subprocess, concurrent.futures,
+# http.server) are imported inside the functions that use them, so commands
+# that never touch the blog or the daemon start quickly. See STARTUP_BUDGET_MS.
+
+# ==========================================
+# Configuration
+# ==========================================
+
+SCRIPT_DIR = Path(__file__).parent
+BLOG_DIR = SCRIPT_DIR / 'blog'
+POSTS_DIR = BLOG_DIR / 'posts'
+TEMPLATE_FILE = BLOG_DIR / 'template.html'
+BLOG_INDEX_FILE = SCRIPT_DIR / 'blog.html'
+IMGS_DIR = SCRIPT_DIR / "imgs"
+
+CACHE_DIR = SCRIPT_DIR / ".build_cache"
+IMAGE_CATALOG_CACHE = CACHE_DIR / "image_catalog.json"
+IMAGE_CATALOG_VERSION = 1
+
+SERVICE_WORKER_FILE = SCRIPT_DIR / "sw.js"
+# Root pages that are not part of the public site and are never precached
+PRECACHE_EXCLUDE = {'template.html', 'test.html'}
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.avif'}
+
+# Streaming mode: pages are read in STREAM_CHUNK_SIZE chunks and at most
+# STREAM_MAX_LOOKAHEAD characters are buffered while looking for the end of a
+# header/footer/placeholder/partners region. Pages over STREAM_THRESHOLD bytes
+# always stream.
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_MAX_LOOKAHEAD = 1024 * 1024
+STREAM_THRESHOLD = 8 * 1024 * 1024
+
+# Resource hints injected into <head> between these markers
+RESOURCE_HINTS_START = '<!-- RESOURCE_HINTS_START -->'
+RESOURCE_HINTS_END = '<!-- RESOURCE_HINTS_END -->'
+# Fonts preloaded on every page using css/style.css: the hero heading (700)
+# and body text (400) faces of Montserrat
+KEY_FONTS = ['fonts/Montserrat-Bold.ttf', 'fonts/Montserrat-Regular.ttf']
+
+# Interactive canvases that get a build-time SVG poster, as canvas id ->
+# (scene, width, height). Each scene mirrors draw() in js/autocollimator-<scene>.js
+# with the sliders at zero. The poster is written between POSTER markers, and
+# the page only loads the experiment scripts once the canvas scrolls into view.
+POSTER_SCENES = {
+    'sourceCanvas': ('source', 1000, 480),
+    'slaCanvas': ('sla', 1000, 480),
+}
+POSTER_START = '<!-- POSTER_START {} -->'
+POSTER_END = '<!-- POSTER_END -->'
+# Mirrors of ExperimentLib.Colors in js/experiment-shared.js. Its Main and
+# Label fonts are both 400 14px Montserrat.
+EXPERIMENT_COLORS = {
+    'BG': '#011D49',
+    'WHITE': '#ffffff',
+    'GREEN': '#cce85e',
+    'AXIS': 'rgba(255, 255, 255, 0.15)',
+    'BEAMSPLITTER': 'rgba(255, 255, 255, 0.5)',
+    'LENS_GLASS': 'rgba(200, 230, 255, 0.1)',
+}
+
+# Placeholder fuzzy matching: the closest match at or above FUZZY_MATCH_CUTOFF is used
+# (with a warning); anything above FUZZY_SUGGEST_CUTOFF is offered as "did you mean"
+FUZZY_MATCH_CUTOFF = 0.85
+FUZZY_SUGGEST_CUTOFF = 0.6
+
+# Build graph: for each output, the inputs it was rendered from, recorded
+# while building and saved to BUILD_GRAPH_CACHE for targeted rebuilds.
+# Templates defined in this script and the image catalog as a whole are
+# represented by these pseudo-nodes.
+BUILD_GRAPH_CACHE = CACHE_DIR / "build_graph.json"
+BUILD_GRAPH_VERSION = 1
+HEADER_NODE = 'partial:header'
+FOOTER_NODE = 'partial:footer'
+PARTIAL_NODES = (HEADER_NODE, FOOTER_NODE)
+IMAGE_CATALOG_NODE = 'imgs/'
+BUILD_WORKERS = min(8, os.cpu_count() or 1)
+
+# Startup budget for `build.py help` (checked by benchmarks/startup.py): the
+# time it may take above the `python -c pass` floor measured in the same run,
+# for loading this module from cached bytecode and dispatching the command.
+# Measured at about 25-30 ms above a 13 ms floor; the rest is headroom for
+# slow or busy machines.
+STARTUP_BUDGET_MS = 75
+# Deferred imports; benchmarks/startup.py fails if a lightweight command
+# imports one it does not need
+LAZY_MODULES = ('markdown', 'yaml', 'http.server', 'subprocess', 'difflib', 'concurrent.futures')
+
+# Build daemon (--serve): local-only HTTP API for previews and rebuilds
+DAEMON_HOST = '127.0.0.1'
+DAEMON_PORT = 8765
+
+_build_graph = {}
+_build_graph_lock = threading.Lock()
+
+# Loaded on first use by get_image_catalog() so imgs/ is scanned once per build
+_image_catalog = None
+
+# ==========================================
+# Standard Templates
+# ==========================================
+
+# Standard footer HTML (for root-level pages). The footer also carries the
+# service worker registration so every page built from these templates gets it.
+STANDARD_FOOTER = """    <footer>
+        <p>&copy; 2026 Fringe Metrology. All rights reserved.</p>
+        <div class="footer-links">
+            <a href="contact.html">Contact Us</a>
+            <span class="footer-divider">|</span>
+            <a href="terms.html">Terms of Use</a>
+            <span class="footer-divider">|</span>
+            <a href="privacy.html">Privacy Policy</a>
+        </div>
+        <script>
+            if ('serviceWorker' in navigator) {
+                window.addEventListener('load', () => navigator.serviceWorker.register('sw.js'));
+            }
+        </script>
+    </footer>"""
+
+# Standard footer HTML (for blog/ pages - uses relative paths)
+STANDARD_FOOTER_BLOG = """    <footer>
+        <p>&copy; 2026 Fringe Metrology. All rights reserved.</p>
+        <div class="footer-links">
+            <a href="../contact.html">Contact Us</a>
+            <span class="footer-divider">|</span>
+            <a href="../terms.html">Terms of Use</a>
+            <span class="footer-divider">|</span>
+            <a href="../privacy.html">Privacy Policy</a>
+        </div>
+        <script>
+            if ('serviceWorker' in navigator) {
+                window.addEventListener('load', () => navigator.serviceWorker.register('../sw.js'));
+            }
+        </script>
+    </footer>"""
+
+# Standard header HTML (for root-level pages)
+STANDARD_HEADER = """    <header class="scrolled">
+        <div class="logo-container">
+            <a href="index.html" class="logo-link">
+                <img src="imgs/color.png" alt="Fringe Metrology Logo" class="logo-img">
+                <span class="logo-text">Fringe Metrology</span>
+            </a>
+        </div>
+        <nav>
+            <ul>
+                <li class="nav-item">
+                    <a href="#">Products</a>
+                    <div class="dropdown">
+                        <div class="dropdown-content">
+                            <div class="dropdown-featured">
+                                <a href="fringescan.html" class="featured-card">
+                                    <div class="card-image" style="background-image: url('imgs/fringescan.gif')"></div>
+                                    <div class="card-text">
+                                        <h4>FringeScan</h4>
+                                        <p>High precision, large area surface scanning<svg class="arrow-right"
+                                                width="12" height="12" viewBox="0 0 24 24" fill="none"
+                                                stroke="currentColor" stroke-width="3" stroke-linecap="round"
+                                                stroke-linejoin="round">
+                                                <line x1="7" y1="17" x2="17" y2="7"></line>
+                                                <polyline points="7 7 17 7 17 17"></polyline>
+                                            </svg></p>
+                                    </div>
+                                </a>
+                                <a href="fringeshot.html" class="featured-card">
+                                    <div class="card-image" style="background-image: url('imgs/16mm_fringeshot.jpg')">
+                                    </div>
+                                    <div class="card-text">
+                                        <h4>FringeShot</h4>
+                                        <p>Rapid Capture Technology <svg class="arrow-right" width="12" height="12"
+                                                viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="3"
+                                                stroke-linecap="round" stroke-linejoin="round">
+                                                <line x1="7" y1="17" x2="17" y2="7"></line>
+                                                <polyline points="7 7 17 7 17 17"></polyline>
+                                            </svg></p>
+                                    </div>
+                                </a>
+                            </div>
+                        </div>
+                    </div>
+                </li>
+                <li class="nav-item">
+                    <a href="#">Technology</a>
+                    <div class="dropdown">
+                        <div class="dropdown-content">
+                            <div class="dropdown-featured">
+                                <a href="projection.html" class="featured-card">
+                                    <div class="card-image" style="background-image: url('imgs/fringescan_custom_systems.jpg')"></div>
+                                    <div class="card-text">
+                                        <h4>Fringe Projection Profilometry</h4>
+                                        <p>High precision, large surfaces <svg class="arrow-right" width="12"
+                                                height="12" viewBox="0 0 24 24" fill="none" stroke="currentColor"
+                                                stroke-width="3" stroke-linecap="round" stroke-linejoin="round">
+                                                <line x1="7" y1="17" x2="17" y2="7"></line>
+                                                <polyline points="7 7 17 7 17 17"></polyline>
+                                            </svg></p>
+                                    </div>
+                                </a>
+                                <a href="structured-light.html" class="featured-card">
+                                    <div class="card-image" style="background-image: url('imgs/chips.png')"></div>
+                                    <div class="card-text">
+                                        <h4>Structured Light Autocollimator</h4>
+                                        <p>Ultra precision, small surface <svg class="arrow-right" width="12"
+                                                height="12" viewBox="0 0 24 24" fill="none" stroke="currentColor"
+                                                stroke-width="3" stroke-linecap="round" stroke-linejoin="round">
+                                                <line x1="7" y1="17" x2="17" y2="7"></line>
+                                                <polyline points="7 7 17 7 17 17"></polyline>
+                                            </svg></p>
+                                    </div>
+                                </a>
+                            </div>
+                        </div>
+                    </div>
+                </li>
+                <li class="nav-item"><a href="about.html">About Us</a></li>
+                <li class="nav-item"><a href="blog.html">Blog</a></li>
+                <li class="nav-item"><a href="contact.html">Contact Us</a></li>
+            </ul>
+        </nav>
+        <button class="mobile-nav-toggle" aria-label="Toggle navigation">
+            <span class="hamburger-bar"></span>
+            <span class="hamburger-bar"></span>
+            <span class="hamburger-bar"></span>
+        </button>
+    </header>"""
+
+# Standard header for index.html (no scrolled class by default)
+STANDARD_HEADER_INDEX = """    <header>
+        <div class="logo-container">
+            <a href="index.html" class="logo-link">
+                <img src="imgs/color.png" alt="Fringe Metrology Logo" class="logo-img">
+                <span class="logo-text">Fringe Metrology</span>
+            </a>
+        </div>
+        <nav>
+            <ul>
+                <li class="nav-item">
+                    <a href="#">Products</a>
+                    <div class="dropdown">
+                        <div class="dropdown-content">
+                            <div class="dropdown-featured">
+                                <a href="fringescan.html" class="featured-card">
+                                    <div class="card-image" style="background-image: url('imgs/fringescan.gif')"></div>
+                                    <div class="card-text">
+                                        <h4>FringeScan</h4>
+                                        <p>High precision, large area surface scanning<svg class="arrow-right"
+                                                width="12" height="12" viewBox="0 0 24 24" fill="none"
+                                                stroke="currentColor" stroke-width="3" stroke-linecap="round"
+                                                stroke-linejoin="round">
+                                                <line x1="7" y1="17" x2="17" y2="7"></line>
+                                                <polyline points="7 7 17 7 17 17"></polyline>
+                                            </svg></p>
+                                    </div>
+                                </a>
+                                <a href="fringeshot.html" class="featured-card">
+                                    <div class="card-image" style="background-image: url('imgs/16mm_fringeshot.jpg')">
+                                    </div>
+                                    <div class="card-text">
+                                        <h4>FringeShot</h4>
+                                        <p>Rapid Capture Technology <svg class="arrow-right" width="12" height="12"
+                                                viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="3"
+                                                stroke-linecap="round" stroke-linejoin="round">
+                                                <line x1="7" y1="17" x2="17" y2="7"></line>
+                                                <polyline points="7 7 17 7 17 17"></polyline>
+                                            </svg></p>
+                                    </div>
+                                </a>
+                            </div>
+                        </div>
+                    </div>
+                </li>
+                <li class="nav-item">
+                    <a href="#">Technology</a>
+                    <div class="dropdown">
+                        <div class="dropdown-content">
+                            <div class="dropdown-featured">
+                                <a href="projection.html" class="featured-card">
+                                    <div class="card-image" style="background-image: url('imgs/fringescan_custom_systems.jpg')"></div>
+                                    <div class="card-text">
+                                        <h4>Fringe Projection Profilometry</h4>
+                                        <p>High precision, large surfaces <svg class="arrow-right" width="12"
+                                                height="12" viewBox="0 0 24 24" fill="none" stroke="currentColor"
+                                                stroke-width="3" stroke-linecap="round" stroke-linejoin="round">
+                                                <line x1="7" y1="17" x2="17" y2="7"></line>
+                                                <polyline points="7 7 17 7 17 17"></polyline>
+                                            </svg></p>
+                                    </div>
+                                </a>
+                                <a href="structured-light.html" class="featured-card">
+                                    <div class="card-image" style="background-image: url('imgs/chips.png')"></div>
+                                    <div class="card-text">
+                                        <h4>Structured Light Autocollimator</h4>
+                                        <p>Ultra precision, small surface <svg class="arrow-right" width="12"
+                                                height="12" viewBox="0 0 24 24" fill="none" stroke="currentColor"
+                                                stroke-width="3" stroke-linecap="round" stroke-linejoin="round">
+                                                <line x1="7" y1="17" x2="17" y2="7"></line>
+                                                <polyline points="7 7 17 7 17 17"></polyline>
+                                            </svg></p>
+                                    </div>
+                                </a>
+                            </div>
+                        </div>
+                    </div>
+                </li>
+                <li class="nav-item"><a href="about.html">About Us</a></li>
+                <li class="nav-item"><a href="blog.html">Blog</a></li>
+                <li class="nav-item"><a href="contact.html">Contact Us</a></li>
+            </ul>
+        </nav>
+        <button class="mobile-nav-toggle" aria-label="Toggle navigation">
+            <span class="hamburger-bar"></span>
+            <span class="hamburger-bar"></span>
+            <span class="hamburger-bar"></span>
+        </button>
+    </header>"""
+
+# Standard header HTML (for blog/ pages - uses relative paths)
+STANDARD_HEADER_BLOG = """    <header class="scrolled">
+        <div class="logo-container">
+            <a href="../index.html" class="logo-link">
+                <img src="../imgs/color.png" alt="Fringe Metrology Logo" class="logo-img">
+                <span class="logo-text">Fringe Metrology</span>
+            </a>
+        </div>
+        <nav>
+            <ul>
+                <li class="nav-item">
+                    <a href="#">Products</a>
+                    <div class="dropdown">
+                        <div class="dropdown-content">
+                            <div class="dropdown-featured">
+                                <a href="../fringescan.html" class="featured-card">
+                                    <div class="card-image" style="background-image: url('../imgs/fringescan.gif')"></div>
+                                    <div class="card-text">
+                                        <h4>FringeScan</h4>
+                                        <p>High precision, large area surface scanning<svg class="arrow-right"
+                                                width="12" height="12" viewBox="0 0 24 24" fill="none"
+                                                stroke="currentColor" stroke-width="3" stroke-linecap="round"
+                                                stroke-linejoin="round">
+                                                <line x1="7" y1="17" x2="17" y2="7"></line>
+                                                <polyline points="7 7 17 7 17 17"></polyline>
+                                            </svg></p>
+                                    </div>
+                                </a>
+                                <a href="../fringeshot.html" class="featured-card">
+                                    <div class="card-image" style="background-image: url('../imgs/16mm_fringeshot.jpg')">
+                                    </div>
+                                    <div class="card-text">
+                                        <h4>FringeShot</h4>
+                                        <p>Rapid Capture Technology <svg class="arrow-right" width="12" height="12"
+                                                viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="3"
+                                                stroke-linecap="round" stroke-linejoin="round">
+                                                <line x1="7" y1="17" x2="17" y2="7"></line>
+                                                <polyline points="7 7 17 7 17 17"></polyline>
+                                            </svg></p>
+                                    </div>
+                                </a>
+                            </div>
+                        </div>
+                    </div>
+                </li>
+                <li class="nav-item">
+                    <a href="#">Technology</a>
+                    <div class="dropdown">
+                        <div class="dropdown-content">
+                            <div class="dropdown-featured">
+                                <a href="../projection.html" class="featured-card">
+                                    <div class="card-image" style="background-image: url('../imgs/fringescan_custom_systems.jpg')"></div>
+                                    <div class="card-text">
+                                        <h4>Fringe Projection Profilometry</h4>
+                                        <p>High precision, large surfaces <svg class="arrow-right" width="12"
+                                                height="12" viewBox="0 0 24 24" fill="none" stroke="currentColor"
+                                                stroke-width="3" stroke-linecap="round" stroke-linejoin="round">
+                                                <line x1="7" y1="17" x2="17" y2="7"></line>
+                                                <polyline points="7 7 17 7 17 17"></polyline>
+                                            </svg></p>
+                                    </div>
+                                </a>
+                                <a href="../structured-light.html" class="featured-card">
+                                    <div class="card-image" style="background-image: url('../imgs/chips.png')"></div>
+                                    <div class="card-text">
+                                        <h4>Structured Light Autocollimator</h4>
+                                        <p>Ultra precision, small surface <svg class="arrow-right" width="12"
+                                                height="12" viewBox="0 0 24 24" fill="none" stroke="currentColor"
+                                                stroke-width="3" stroke-linecap="round" stroke-linejoin="round">
+                                                <line x1="7" y1="17" x2="17" y2="7"></line>
+                                                <polyline points="7 7 17 7 17 17"></polyline>
+                                            </svg></p>
+                                    </div>
+                                </a>
+                            </div>
+                        </div>
+                    </div>
+                </li>
+                <li class="nav-item"><a href="../about.html">About Us</a></li>
+                <li class="nav-item"><a href="../blog.html">Blog</a></li>
+                <li class="nav-item"><a href="../contact.html">Contact Us</a></li>
+            </ul>
+        </nav>
+        <button class="mobile-nav-toggle" aria-label="Toggle navigation">
+            <span class="hamburger-bar"></span>
+            <span class="hamburger-bar"></span>
+            <span class="hamburger-bar"></span>
+        </button>
+    </header>"""
+
+# Service worker generated into SERVICE_WORKER_FILE by run_build_service_worker().
+# Precached entries are stored under "<url>?__rev=<revision>" so an asset is only
+# re-downloaded when its content hash changes, and are served cache-first.
+# Blog pages are served stale-while-revalidate; other pages are network-first
+# with a timeout, falling back to the cache when offline.
+SERVICE_WORKER_TEMPLATE = """/* Generated by build.py - do not edit directly. */
+const PRECACHE_VERSION = '{{ version }}';
+const PRECACHE = 'fm-precache';
+const RUNTIME = 'fm-runtime-' + PRECACHE_VERSION;
+const NETWORK_TIMEOUT_MS = 3000;
+
+const PRECACHE_MANIFEST = {{ manifest }};
+
+const BLOG_PAGES = new Set({{ blog_pages }});
+
+const scopeUrl = (path) => new URL(path, self.registration.scope).href;
+const cacheKey = (entry) => scopeUrl(entry.url) + '?__rev=' + entry.revision;
+const precacheKeys = new Map(PRECACHE_MANIFEST.map(entry => [scopeUrl(entry.url), cacheKey(entry)]));
+
+self.addEventListener('install', (event) => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(PRECACHE);
+        await Promise.all(PRECACHE_MANIFEST.map(async (entry) => {
+            const key = cacheKey(entry);
+            if (await cache.match(key)) {
+                return;
+            }
+            const response = await fetch(scopeUrl(entry.url), { cache: 'reload' });
+            if (response.ok) {
+                await cache.put(key, response);
+            }
+        }));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', (event) => {
+    event.waitUntil((async () => {
+        // Drop precache revisions that are no longer in the manifest
+        const cache = await caches.open(PRECACHE);
+        const current = new Set(precacheKeys.values());
+        for (const request of await cache.keys()) {
+            if (!current.has(request.url)) {
+                await cache.delete(request);
+            }
+        }
+        // Pages cached by an older deploy may predate the new precache
+        for (const name of await caches.keys()) {
+            if (name.startsWith('fm-runtime-') && name !== RUNTIME) {
+                await caches.delete(name);
+            }
+        }
+        await self.clients.claim();
+    })());
+});
+
+function pageUrl(url) {
+    const page = new URL(url);
+    page.search = '';
+    page.hash = '';
+    if (page.href === self.registration.scope) {
+        page.href = scopeUrl('index.html');
+    }
+    return page.href;
+}
+
+async function cachedPage(url) {
+    const runtime = await caches.open(RUNTIME);
+    const cached = await runtime.match(url);
+    if (cached) {
+        return cached;
+    }
+    const key = precacheKeys.get(url);
+    return key ? (await caches.open(PRECACHE)).match(key) : undefined;
+}
+
+async function fetchAndCache(request, url) {
+    const response = await fetch(request);
+    if (response.ok) {
+        const runtime = await caches.open(RUNTIME);
+        await runtime.put(url, response.clone());
+    }
+    return response;
+}
+
+async function staleWhileRevalidate(event, url) {
+    const cached = await cachedPage(url);
+    const network = fetchAndCache(event.request, url);
+    if (cached) {
+        event.waitUntil(network.catch(() => undefined));
+        return cached;
+    }
+    return network;
+}
+
+async function networkFirst(event, url) {
+    const network = fetchAndCache(event.request, url);
+    const timeout = new Promise(resolve => setTimeout(resolve, NETWORK_TIMEOUT_MS));
+    try {
+        const response = await Promise.race([network, timeout]);
+        if (response) {
+            return response;
+        }
+    } catch (error) {
+        // Offline: fall through to the cache
+    }
+    const cached = await cachedPage(url);
+    if (cached) {
+        event.waitUntil(network.catch(() => undefined));
+        return cached;
+    }
+    return network;
+}
+
+async function cacheFirst(request, key) {
+    const cached = await (await caches.open(PRECACHE)).match(key);
+    return cached || fetch(request);
+}
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    if (request.method !== 'GET' || !request.url.startsWith(self.registration.scope)) {
+        return;
+    }
+    const url = pageUrl(request.url);
+    const page = url.slice(self.registration.scope.length);
+
+    if (request.mode === 'navigate' || page.endsWith('.html')) {
+        if (BLOG_PAGES.has(page)) {
+            event.respondWith(staleWhileRevalidate(event, url));
+        } else {
+            event.respondWith(networkFirst(event, url));
+        }
+    } else if (precacheKeys.has(url)) {
+        event.respondWith(cacheFirst(request, precacheKeys.get(url)));
+    }
+});
+"""
+
+# ==========================================
+# Output Filesystem
+# ==========================================
+
+# Every generated file is read and written through these helpers. Inside
+# virtual_outputs() writes are collected in memory ({Path: content}) instead
+# of touching disk, and later reads in the same run see them, so the whole
+# pipeline can run in memory for --dry-run diffs or tests.
+_virtual_outputs = None
+_virtual_outputs_lock = threading.Lock()
+
+@contextlib.contextmanager
+def virtual_outputs():
+    """Collect all output writes in memory for the duration of the block."""
+    global _virtual_outputs
+    previous = _virtual_outputs
+    _virtual_outputs = {}
+    try:
+        yield _virtual_outputs
+    finally:
+        _virtual_outputs = previous
+
+def output_exists(path):
+    path = Path(path)
+    return (_virtual_outputs is not None and path in _virtual_outputs) or path.exists()
+
+def output_glob(directory, pattern):
+    """Sorted glob of a directory that includes outputs only written in memory."""
+    import fnmatch
+    
+    paths = set(Path(directory).glob(pattern))
+    if _virtual_outputs is not None:
+        paths.update(p for p in _virtual_outputs if p.parent == Path(directory) and fnmatch.fnmatch(p.name, pattern))
+    return sorted(paths)
+
+def read_output(path):
+    """Read a generated (or to-be-regenerated) file as text."""
+    path = Path(path)
+    if _virtual_outputs is not None and path in _virtual_outputs:
+        return _virtual_outputs[path]
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def open_output(path):
+    """Open a generated file for streaming reads."""
+    path = Path(path)
+    if _virtual_outputs is not None and path in _virtual_outputs:
+        return io.StringIO(_virtual_outputs[path])
+    return open(path, 'r', encoding='utf-8')
+
+def write_output(path, content, dry_run=False):
+    """Write a generated file: in memory inside virtual_outputs(), skipped on
+    a plain dry run, otherwise to disk."""
+    path = Path(path)
+    if _virtual_outputs is not None:
+        with _virtual_outputs_lock:
+            _virtual_outputs[path] = content
+    elif not dry_run:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+def report_output_changes(outputs, show_diff=False):
+    """Print a summary (or unified diffs) of in-memory outputs against disk."""
+    import difflib
+    
+    changed = 0
+    for path in sorted(outputs):
+        old = path.read_text(encoding='utf-8') if path.exists() else ''
+        new = outputs[path]
+        if old == new:
+            continue
+        changed += 1
+        name = node_name(path)
+        diff = list(difflib.unified_diff(old.splitlines(keepends=True), new.splitlines(keepends=True),
+                                         f"a/{name}", f"b/{name}"))
+        added = sum(1 for line in diff if line.startswith('+') and not line.startswith('+++'))
+        removed = sum(1 for line in diff if line.startswith('-') and not line.startswith('---'))
+        status = 'A' if not path.exists() else 'M'
+        print(f"  {status} {name} (+{added} -{removed})")
+        if show_diff:
+            sys.stdout.writelines(diff)
+            if diff and not diff[-1].endswith('\n'):
+                print()
+    print(f"{changed} file(s) would change" if changed else "No files would change")
+    return changed
+
+# ==========================================
+# Blog Building Functions
+# ==========================================
+
+def load_template():
+    if not output_exists(TEMPLATE_FILE):
+        print(f"Error: Template file not found at {TEMPLATE_FILE}")
+        return ""
+    return read_output(TEMPLATE_FILE)
+
+def _parse_frontmatter(f):
+    # Read the frontmatter line by line so only the Markdown body is
+    # held as a single string (Markdown conversion needs all of it)
+    first_line = f.readline()
+    if first_line.startswith('---'):
+        frontmatter = [first_line[3:]]
+        for line in f:
+            if line.startswith('---'):
+                import yaml
+                metadata = yaml.safe_load(''.join(frontmatter))
+                if metadata is None:
+                    metadata = {}
+                elif not isinstance(metadata, dict):
+                    raise ValueError(f"Frontmatter must be a mapping, not {type(metadata).__name__}")
+                markdown_content = line[3:] + f.read()
+                return metadata, markdown_content
+            frontmatter.append(line)
+        f.seek(0)
+        return {}, f.read()
+    content = first_line + f.read()
+    
+    # Fallback if no frontmatter
+    return {}, content
+
+def parse_post(filepath):
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return _parse_frontmatter(f)
+
+def parse_post_text(text):
+    """parse_post() for Markdown that has not been saved to disk."""
+    return _parse_frontmatter(io.StringIO(text))
+
+def generate_post_html(metadata, markdown_content, template, converter=None, output_path=None):
+    # Convert markdown to HTML (the daemon passes a reusable Markdown instance)
+    if converter is not None:
+        html_content = converter.reset().convert(markdown_content)
+    else:
+        import markdown
+        html_content = markdown.markdown(markdown_content)
+    
+    # Inject into template
+    title = metadata.get('title', 'Blog Post')
+    image = metadata.get('image', '')
+    
+    hero_class = ""
+    hero_style = ""
+    
+    if image:
+        hero_class = "has-image"
+        # image in frontmatter might have ../imgs/foo.png
+        # Since the page is now in root, we remove ../
+        if image.startswith('../'):
+            image = image[3:]
+        hero_style = f"background-image: url('{image}');"
+    
+    # Also fix paths inside markdown content
+    html_content = html_content.replace('../imgs/', 'imgs/')
+    html_content = html_content.replace('../index.html', 'index.html')
+    html_content = html_content.replace('../blog.html', 'blog.html')
+    html_content = html_content.replace('../contact.html', 'contact.html')
+    html_content = html_content.replace('../about.html', 'about.html')
+    
+    # Format date
+    date_obj = metadata.get('date')
+    if isinstance(date_obj, str):
+        try:
+            date_obj = datetime.datetime.strptime(date_obj, '%Y-%m-%d')
+        except:
+            date_obj = datetime.datetime.now()
+    elif not date_obj:
+        date_obj = datetime.datetime.now()
+        
+    date_str = date_obj.strftime('%B %d, %Y')
+    
+    # Simple replacement - in a real app might use Jinja2
+    output_html = template.replace('{{ title }}', title)
+    output_html = output_html.replace('{{ content }}', html_content)
+    output_html = output_html.replace('{{ hero_class }}', hero_class)
+    output_html = output_html.replace('{{ hero_style }}', hero_style)
+    output_html = output_html.replace('{{ date }}', date_str)
+    
+    # The hero_style image is the post's LCP element, so it is preloaded here
+    # rather than only when the pages pass runs
+    output_html, _ = update_resource_hints(output_html, image_catalog=get_image_catalog(), page=output_path)
+    return output_html
+
+def update_blog_index(posts):
+    if not output_exists(BLOG_INDEX_FILE):
+        print(f"Error: Blog index file not found at {BLOG_INDEX_FILE}")
+        return
+
+    content = read_output(BLOG_INDEX_FILE)
+    
+    # Sort posts by date desc (normalize to string for consistent comparison)
+    def get_date_key(post):
+        date = post.get('date')
+        if date is None:
+            return ''
+        if isinstance(date, datetime.date):
+            return date.isoformat()
+        return str(date)
+    
+    posts.sort(key=get_date_key, reverse=True)
+    
+    marker_start = '<!-- BLOG_POSTS_START -->'
+    marker_end = '<!-- BLOG_POSTS_END -->'
+    
+    if marker_start not in content or marker_end not in content:
+        print(f"Error: Markers not found in {BLOG_INDEX_FILE}")
+        return
+
+    # Generate HTML for cards
+    cards_html = f"{marker_start}\n"
+    cards_html += "                    <!-- Posts will be injected here by build_blog.py -->\n"
+    
+    for post in posts:
+        if post.get('hidden') is True:
+            continue
+        # Format date
+        date_obj = post.get('date')
+        if isinstance(date_obj, str):
+             try:
+                date_obj = datetime.datetime.strptime(date_obj, '%Y-%m-%d')
+             except:
+                date_obj = datetime.datetime.now() # Fallback
+        
+        date_str = date_obj.strftime('%B %d, %Y') if date_obj else ""
+        image = post.get('image', 'imgs/card3.jpg')
+        # Fix image path for blog index (which is in root)
+        # Post frontmatter might have ../imgs/foo.png (relative to post file)
+        # We need imgs/foo.png (relative to root)
+        if image.startswith('../'):
+            image = image[3:]
+            
+        link = f"{post['filename'].replace('.md', '.html')}"
+        title = post.get('title', 'Untitled')
+        description = post.get('description', '')
+        
+        cards_html += f'''
+                    <article class="blog-card" data-type="{post.get('type', 'Case Study').replace(' ', '-').lower()}">
+                        <div class="blog-card-image" style="background-image: url('{image}')"></div>
+                        <div class="blog-card-content">
+                            <span class="blog-type">{post.get('type', 'Case Study')}</span>
+                            <span class="blog-date">{date_str}</span>
+                            <h3>{title}</h3>
+                            <p>{description}</p>
+                            <a href="{link}" class="read-more">Read More <svg class="arrow-right" width="12" height="12"
+                                    viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="3"
+                                    stroke-linecap="round" stroke-linejoin="round">
+                                    <line x1="7" y1="17" x2="17" y2="7"></line>
+                                    <polyline points="7 7 17 7 17 17"></polyline>
+                                </svg></a>
+                        </div>
+                    </article>
+'''
+    cards_html += f"                    {marker_end}"
+    
+    # Replace content between markers
+    start_idx = content.find(marker_start)
+    end_idx = content.find(marker_end) + len(marker_end)
+    
+    new_content = content[:start_idx] + cards_html + content[end_idx:]
+    
+    write_output(BLOG_INDEX_FILE, new_content)
+    print(f"Updated {BLOG_INDEX_FILE}")
+
+def build_post(filename, template):
+    """Render one Markdown post to its root-level HTML page and return its metadata."""
+    print(f"Processing {filename}...")
+    metadata, markdown_content = parse_post(filename)
+    
+    # Add filename to metadata for linking
+    metadata['filename'] = os.path.basename(filename)
+    
+    # Save HTML file in root directory
+    output_filename = os.path.basename(filename).replace('.md', '.html')
+    output_path = SCRIPT_DIR / output_filename
+    
+    # Generate HTML
+    html = generate_post_html(metadata, markdown_content, template, output_path=output_path)
+    
+    write_output(output_path, html)
+    
+    record_dependency(output_path, filename)
+    record_dependency(output_path, TEMPLATE_FILE)
+    print(f"Saved {output_path}")
+    return metadata
+
+def collect_post_metadata():
+    """Parse every post's frontmatter (for rebuilding blog.html on its own)."""
+    posts = []
+    for filename in sorted(glob.glob(os.path.join(POSTS_DIR, '*.md'))):
+        metadata, _ = parse_post(filename)
+        metadata['filename'] = os.path.basename(filename)
+        posts.append(metadata)
+    return posts
+
+def run_build_blog():
+    print("\n=== Building Blog ===\n")
+    if not POSTS_DIR.exists():
+        print(f"No posts directory found at {POSTS_DIR}")
+        return
+
+    template = load_template()
+    if not template:
+        return
+
+    filenames = glob.glob(os.path.join(POSTS_DIR, '*.md'))
+    processed_posts = run_parallel(lambda filename: build_post(filename, template), filenames)
+
+    update_blog_index(processed_posts)
+    for filename in filenames:
+        record_dependency(BLOG_INDEX_FILE, filename)
+
+# ==========================================
+# Placeholder & Common Elements Functions
+# ==========================================
+
+def _sniff_image_format(data, suffix):
+    """Detect the real image format from magic bytes, falling back to the file suffix."""
+    if data[:8] == b'\x89PNG\r\n\x1a\n':
+        return 'png'
+    if data[:3] == b'GIF':
+        return 'gif'
+    if data[:2] == b'\xff\xd8':
+        return 'jpeg'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'webp'
+    if data[4:8] == b'ftyp' and data[8:12] in (b'avif', b'avis'):
+        return 'avif'
+    fmt = suffix.lower().lstrip('.')
+    return 'jpeg' if fmt == 'jpg' else fmt
+
+def _read_image_dimensions(data, fmt):
+    """Return (width, height) parsed from the image header, or (None, None)."""
+    try:
+        if fmt == 'png':
+            return struct.unpack('>II', data[16:24])
+        if fmt == 'gif':
+            return struct.unpack('<HH', data[6:10])
+        if fmt == 'jpeg':
+            # Walk the JPEG markers until we hit a start-of-frame segment
+            i = 2
+            while i + 9 < len(data):
+                if data[i] != 0xFF:
+                    i += 1
+                    continue
+                marker = data[i + 1]
+                if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7 or marker == 0xFF:
+                    i += 1 if marker == 0xFF else 2
+                    continue
+                length = struct.unpack('>H', data[i + 2:i + 4])[0]
+                if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                    height, width = struct.unpack('>HH', data[i + 5:i + 9])
+                    return width, height
+                i += 2 + length
+        if fmt == 'webp':
+            chunk = data[12:16]
+            if chunk == b'VP8 ':
+                width, height = struct.unpack('<HH', data[26:30])
+                return width & 0x3FFF, height & 0x3FFF
+            if chunk == b'VP8L':
+                bits = int.from_bytes(data[21:25], 'little')
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b'VP8X':
+                return (int.from_bytes(data[24:27], 'little') + 1,
+                        int.from_bytes(data[27:30], 'little') + 1)
+        if fmt == 'avif':
+            # The image spatial extents ('ispe') box holds the pixel size
+            idx = data.find(b'ispe')
+            if idx != -1:
+                return struct.unpack('>II', data[idx + 8:idx + 16])
+        if fmt == 'svg':
+            text = data[:4096].decode('utf-8', errors='ignore')
+            svg_tag = re.search(r'<svg\b[^>]*>', text)
+            if svg_tag:
+                attrs = svg_tag.group(0)
+                width = re.search(r'\swidth="([\d.]+)(?:px)?"', attrs)
+                height = re.search(r'\sheight="([\d.]+)(?:px)?"', attrs)
+                if width and height:
+                    return round(float(width.group(1))), round(float(height.group(1)))
+                view_box = re.search(r'viewBox="[\d.\-]+[\s,]+[\d.\-]+[\s,]+([\d.]+)[\s,]+([\d.]+)"', attrs)
+                if view_box:
+                    return round(float(view_box.group(1))), round(float(view_box.group(2)))
+    except (struct.error, ValueError, IndexError):
+        pass
+    return None, None
+
+def _scan_image(img_file, rel_name):
+    """Read a single image and return its catalog entry."""
+    data = img_file.read_bytes()
+    stat = img_file.stat()
+    fmt = _sniff_image_format(data, img_file.suffix)
+    width, height = _read_image_dimensions(data, fmt)
+    return {
+        'name': rel_name,
+        'stem': img_file.stem.lower(),
+        'format': fmt,
+        'width': width,
+        'height': height,
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'hash': hashlib.sha256(data).hexdigest(),
+    }
+
+def _load_catalog_cache():
+    if not IMAGE_CATALOG_CACHE.exists():
+        return None
+    try:
+        with open(IMAGE_CATALOG_CACHE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get('version') != IMAGE_CATALOG_VERSION:
+        return None
+    return cached
+
+def _save_catalog_cache(catalog):
+    try:
+        IMAGE_CATALOG_CACHE.parent.mkdir(exist_ok=True)
+        with open(IMAGE_CATALOG_CACHE, 'w', encoding='utf-8') as f:
+            json.dump({k: catalog[k] for k in ('version', 'dirs', 'images')}, f, indent=1, sort_keys=True)
+    except OSError as e:
+        print(f"Warning: could not write image catalog cache: {e}")
+
+def _dirs_unchanged(cached):
+    """True if no directory under imgs/ has gained or lost entries since the cache was written."""
+    for rel_dir, mtime in cached['dirs'].items():
+        try:
+            if (IMGS_DIR / rel_dir).stat().st_mtime_ns != mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+def _index_catalog(catalog):
+    """Build the in-memory lookup tables (not persisted)."""
+    by_name = {}
+    by_stem = {}
+    # Shallow paths first so a top-level image wins over a same-named one in a subdirectory
+    for rel_name in sorted(catalog['images'], key=lambda n: (n.count('/'), n)):
+        entry = catalog['images'][rel_name]
+        by_name.setdefault(rel_name.lower(), rel_name)
+        by_name.setdefault(Path(rel_name).name.lower(), rel_name)
+        by_stem.setdefault(entry['stem'], rel_name)
+        by_stem.setdefault(str(Path(rel_name).with_suffix('')).lower(), rel_name)
+    catalog['by_name'] = by_name
+    catalog['by_stem'] = by_stem
+    return catalog
+
+def load_image_catalog(previous=None):
+    """Scan imgs/ (recursively) into a catalog of per-image metadata.
+
+    The catalog is persisted to IMAGE_CATALOG_CACHE. When no directory mtime has
+    changed, the directory listing is taken from the cache and only files whose
+    size or mtime differ are re-read. A previous in-memory catalog can be
+    passed instead of reading the cache file.
+    """
+    catalog = {'version': IMAGE_CATALOG_VERSION, 'dirs': {}, 'images': {}}
+    if not IMGS_DIR.exists():
+        print(f"Warning: imgs directory not found at {IMGS_DIR}")
+        return _index_catalog(catalog)
+
+    cached = previous or _load_catalog_cache()
+    if cached and _dirs_unchanged(cached):
+        candidates = [IMGS_DIR / rel_name for rel_name in cached['images']]
+        catalog['dirs'] = cached['dirs']
+    else:
+        candidates = []
+        for dirpath, dirnames, filenames in os.walk(IMGS_DIR):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+            dir_path = Path(dirpath)
+            catalog['dirs'][dir_path.relative_to(IMGS_DIR).as_posix()] = dir_path.stat().st_mtime_ns
+            for filename in sorted(filenames):
+                if Path(filename).suffix.lower() in IMAGE_EXTENSIONS:
+                    candidates.append(dir_path / filename)
+
+    old_images = cached['images'] if cached else {}
+    changed = cached is None
+    for img_file in candidates:
+        rel_name = img_file.relative_to(IMGS_DIR).as_posix()
+        try:
+            stat = img_file.stat()
+        except OSError:
+            changed = True
+            continue
+        old_entry = old_images.get(rel_name)
+        if old_entry and old_entry['size'] == stat.st_size and old_entry['mtime'] == stat.st_mtime_ns:
+            catalog['images'][rel_name] = old_entry
+        else:
+            catalog['images'][rel_name] = _scan_image(img_file, rel_name)
+            changed = True
+
+    if changed or catalog['dirs'] != (cached or {}).get('dirs') or len(catalog['images']) != len(old_images):
+        # Dry runs (virtual_outputs()) leave .build_cache/ alone too
+        if _virtual_outputs is None:
+            _save_catalog_cache(catalog)
+    return _index_catalog(catalog)
+
+def get_image_catalog(refresh=False):
+    """Return the image catalog, loading it at most once per process.
+
+    refresh=True revalidates the in-memory catalog against imgs/ (used by the
+    build daemon, which outlives any single build).
+    """
+    global _image_catalog
+    if _image_catalog is None:
+        _image_catalog = load_image_catalog()
+    elif refresh:
+        _image_catalog = load_image_catalog(_image_catalog)
+    return _image_catalog
+
+def _normalize_image_key(name):
+    return re.sub(r'[\s\-]+', '_', name.strip().lower())
+
+def resolve_image(catalog, placeholder_text):
+    """Resolve placeholder text to an image in the catalog.
+
+    Returns (image_name, suggestions). image_name is the path relative to imgs/
+    or None; suggestions lists near matches worth reporting as "did you mean".
+    Exact names and stems (the placeholder may use any extension) are tried
+    first, then a case/separator-insensitive match, then a close fuzzy match.
+    """
+    full = placeholder_text.strip().lower()
+    # Text with no file name ('.', '/') cannot name an image
+    if not full or not Path(full).name:
+        return None, []
+    stem = str(Path(full).with_suffix(''))
+
+    if full in catalog['by_name']:
+        return catalog['by_name'][full], []
+    for key in (stem, Path(full).stem):
+        if key in catalog['by_stem']:
+            return catalog['by_stem'][key], []
+
+    import difflib
+    normalized = {}
+    for key, rel_name in catalog['by_stem'].items():
+        normalized.setdefault(_normalize_image_key(key), rel_name)
+    wanted = _normalize_image_key(stem)
+    if wanted in normalized:
+        return normalized[wanted], []
+
+    close = difflib.get_close_matches(wanted, list(normalized), n=3, cutoff=FUZZY_SUGGEST_CUTOFF)
+    suggestions = []
+    for key in close:
+        if normalized[key] not in suggestions:
+            suggestions.append(normalized[key])
+    if close and difflib.SequenceMatcher(None, wanted, close[0]).ratio() >= FUZZY_MATCH_CUTOFF:
+        return normalized[close[0]], suggestions
+    return None, suggestions
+
+def find_placeholders(html_content):
+    """Find all image-placeholder divs and their content."""
+    # Match: <div class="image-placeholder">filename.ext</div>
+    pattern = r'<div class="image-placeholder">([^<]+)</div>'
+    return list(re.finditer(pattern, html_content))
+
+def convert_background_to_img(html_content):
+    """Convert background-image style placeholders to img tags."""
+    # Match: <div class="image-placeholder" style="background-image: url('path/to/image.jpg')"></div>
+    # Also handles multi-line versions with </div> on next line
+    pattern = r'<div class="image-placeholder" style="background-image: url\([\'"]([^\'"]+)[\'"]\)">\s*</div>'
+    
+    def replace_with_img(match):
+        img_path = match.group(1)
+        # Extract filename for alt text
+        alt_text = Path(img_path).stem.replace('_', ' ').replace('-', ' ').title()
+        return f'<div class="image-placeholder"><img src="{img_path}" alt="{alt_text}"></div>'
+    
+    new_content = re.sub(pattern, replace_with_img, html_content)
+    changes_made = new_content != html_content
+    return new_content, changes_made
+
+def update_footer(html_content, is_blog=False):
+    """Update the footer to the standard template."""
+    # Match footer tag and all its contents, including any leading whitespace
+    footer_pattern = r'[ \t]*<footer>[\s\S]*?</footer>'
+    standard = STANDARD_FOOTER_BLOG if is_blog else STANDARD_FOOTER
+    
+    new_content, count = re.subn(footer_pattern, standard, html_content)
+    return new_content, count > 0
+
+def update_header(html_content, is_blog=False, is_index=False):
+    """Update the header to the standard template."""
+    # Match header tag and all its contents, including any leading whitespace
+    # (handles both <header> and <header class="scrolled">)
+    header_pattern = r'[ \t]*<header[^>]*>[\s\S]*?</header>'
+    
+    if is_blog:
+        standard = STANDARD_HEADER_BLOG
+    elif is_index:
+        standard = STANDARD_HEADER_INDEX
+    else:
+        standard = STANDARD_HEADER
+    
+    standard = demote_nav_images(standard)
+    
+    new_content, count = re.subn(header_pattern, standard, html_content)
+    return new_content, count > 0
+
+def demote_nav_images(header_html):
+    """Move nav card background images to data-bg so they only load on hover.
+
+    js/main.js copies data-bg into the background-image when a nav item is
+    first hovered or focused, keeping the dropdown GIFs/JPEGs from competing
+    with the page's own LCP image.
+    """
+    return re.sub(r'(<div class="card-image") style="background-image: url\([\'"]([^\'"]+)[\'"]\)"',
+                  r'\1 data-bg="\2"', header_html)
+
+def update_partners_section(html_content, image_catalog):
+    """Update the partners/customers section with static logos display."""
+    # Use explicit markers for reliability
+    partners_pattern = r'(<!-- PARTNERS_START -->)([\s\S]*?)(<!-- PARTNERS_END -->)'
+    
+    # Identify logo images
+    logo_images = []
+    for rel_name, entry in image_catalog['images'].items():
+        if 'logo' in entry['stem']:
+            logo_images.append((entry['stem'], rel_name))
+    
+    if not logo_images:
+        print("No logo images found for partners section.")
+        return html_content, False
+
+    # Sort for consistency
+    logo_images.sort()
+
+    # Generate static display with just the logos (no duplication)
+    # Map filenames to readable alt text
+    alt_text_map = {
+        'composite_mirror_logo.png': 'Composite Mirror Applications',
+        'logo_mtex.avif': 'MTEX',
+        'logo_tech_launch_az.png': 'Tech Launch Arizona'
+    }
+    
+    images_html = ""
+    for _, filename in logo_images:
+        alt_text = alt_text_map.get(Path(filename).name, 'Partner Logo')
+        images_html += f'                    <img src="imgs/{filename}" alt="{alt_text}" class="partner-logo">\n'
+        
+    new_section_content = f"""
+                <div class="partners-static">
+{images_html}                </div>
+                """
+    
+    def replace_content(match):
+        return f"{match.group(1)}{new_section_content}{match.group(3)}"
+    
+    new_content, count = re.subn(partners_pattern, replace_content, html_content)
+    return new_content, count > 0
+
+UPDATE_DESCRIPTIONS = {
+    'conversion': 'Converted background-image placeholders to img tags',
+    'footer': 'Updated to standard footer with legal links',
+    'header': 'Updated to standard header',
+    'partners': 'Updated partners/customers scrolling section',
+    'hints': 'Updated preload/preconnect resource hints',
+    'posters': 'Rendered autocollimator canvas posters',
+}
+
+def _update_record(html_path, update_type):
+    return {
+        'file': html_path.name,
+        'type': update_type,
+        'description': UPDATE_DESCRIPTIONS[update_type]
+    }
+
+def _page_flags(html_path):
+    """Return (is_blog, is_index) for an HTML file."""
+    is_blog = html_path.parent.name == 'blog' and html_path.name != 'template.html'
+    is_index = html_path.name == 'index.html' and not is_blog
+    
+    # Special handling for blog template: it lives in blog/ but is used to generate root pages
+    # so it needs root-relative paths (no ../)
+    if html_path.parent.name == 'blog' and html_path.name == 'template.html':
+        is_blog = False
+    return is_blog, is_index
+
+def update_placeholders(html_content, html_path, image_catalog, is_blog=False, warn=True):
+    """Replace image-placeholder divs with img tags for matching catalog images.
+
+    warn=False skips the near-miss warnings, for a second pass over text
+    that is also resolved normally.
+    """
+    placeholder_updates = []
+    placeholders = find_placeholders(html_content)
+    
+    for match in reversed(placeholders):  # Reverse to preserve positions
+        placeholder_text = match.group(1).strip()
+        
+        # Resolve against the image catalog. The placeholder may specify any
+        # extension, and near misses are matched or reported as suggestions.
+        matched_image, suggestions = resolve_image(image_catalog, placeholder_text)
+        if warn and matched_image and suggestions:
+            print(f"Warning: {html_path.name}: placeholder '{placeholder_text}' has no exact match, "
+                  f"using closest image '{matched_image}'")
+        elif warn and suggestions:
+            print(f"Warning: {html_path.name}: no image for placeholder '{placeholder_text}'. "
+                  f"Did you mean: {', '.join(suggestions)}?")
+        
+        if matched_image:
+            # Determine the relative path to imgs folder
+            if is_blog:
+                img_path = f"../imgs/{matched_image}"
+            else:
+                img_path = f"imgs/{matched_image}"
+            
+            # Create the replacement HTML using img tag for better sizing
+            new_html = f'<div class="image-placeholder"><img src="{img_path}" alt="{placeholder_text}"></div>'
+            
+            # Replace in content
+            html_content = html_content[:match.start()] + new_html + html_content[match.end():]
+            
+            placeholder_updates.append({
+                'file': html_path.name,
+                'type': 'placeholder',
+                'placeholder': placeholder_text,
+                'image': matched_image
+            })
+    
+    return html_content, placeholder_updates
+
+def record_poster_dependencies(html_path, canvas_ids):
+    """A poster is rendered from the scene script it mirrors and ExperimentLib."""
+    for canvas_id in canvas_ids:
+        scene = POSTER_SCENES[canvas_id][0]
+        record_dependency(html_path, SCRIPT_DIR / 'js' / f'autocollimator-{scene}.js')
+        record_dependency(html_path, SCRIPT_DIR / 'js' / 'experiment-shared.js')
+
+def record_common_dependencies(html_path, content, is_index):
+    """Record the template inputs of the header, footer and partners regions in content.
+
+    The edges are recorded even when this build leaves the regions alone
+    (--skip-common), so a later targeted build still picks up template edits.
+    """
+    for kind, start, _ in STREAM_REGIONS:
+        if kind in STREAM_REGION_NODES and (kind != 'partners' or is_index) and start in content:
+            record_dependency(html_path, STREAM_REGION_NODES[kind])
+
+def update_html_file(html_path, image_catalog, dry_run=False, update_common=True, stream=False):
+    """Update placeholders and common elements in a single HTML file.
+
+    Files larger than STREAM_THRESHOLD (or any file when stream=True) are
+    processed in bounded memory by stream_update_html_file().
+    """
+    if not output_exists(html_path):
+        return [], [], [], []
+    
+    in_memory = _virtual_outputs is not None and html_path in _virtual_outputs
+    if stream or (not in_memory and html_path.stat().st_size > STREAM_THRESHOLD):
+        return stream_update_html_file(html_path, image_catalog, dry_run, update_common)
+    
+    content = read_output(html_path)
+    
+    original_content = content
+    common_updates = []
+    conversion_updates = []
+    partner_updates = []
+    
+    is_blog, is_index = _page_flags(html_path)
+    record_common_dependencies(html_path, content, is_index)
+    
+    # First, convert any existing background-image placeholders to img tags
+    content, converted = convert_background_to_img(content)
+    if converted:
+        conversion_updates.append(_update_record(html_path, 'conversion'))
+    
+    # Update placeholders
+    if find_placeholders(content):
+        record_dependency(html_path, IMAGE_CATALOG_NODE)
+    content, placeholder_updates = update_placeholders(content, html_path, image_catalog, is_blog)
+    
+    # Render canvas posters
+    posters = []
+    content, posters_updated = update_posters(content, posters)
+    record_poster_dependencies(html_path, posters)
+    if posters_updated:
+        common_updates.append(_update_record(html_path, 'posters'))
+    
+    # Update common elements if requested
+    if update_common:
+        # Update footer
+        content, footer_updated = update_footer(content, is_blog)
+        if footer_updated:
+            common_updates.append(_update_record(html_path, 'footer'))
+        
+        # Update header
+        content, header_updated = update_header(content, is_blog, is_index)
+        if header_updated:
+            common_updates.append(_update_record(html_path, 'header'))
+        
+        # Update resource hints (after the header, whose images are demoted)
+        content, hints_updated = update_resource_hints(content, is_blog, image_catalog=image_catalog, page=html_path)
+        if hints_updated:
+            common_updates.append(_update_record(html_path, 'hints'))
+            
+        # Update partners section (only for index.html for now)
+        if is_index:
+             content, partners_updated = update_partners_section(content, image_catalog)
+             if partners_updated:
+                 partner_updates.append(_update_record(html_path, 'partners'))
+    else:
+        # The hints are left alone, but their catalog edge is still recorded
+        analyze_page_assets(content, image_catalog, html_path)
+    
+    # Only write if something changed (in memory every page is recorded)
+    if content != original_content or _virtual_outputs is not None:
+        write_output(html_path, content, dry_run)
+    
+    return placeholder_updates, common_updates, conversion_updates, partner_updates
+
+# ==========================================
+# Resource Hints
+# ==========================================
+
+def analyze_page_assets(html_content, image_catalog=None, page=None):
+    """Find the assets worth hinting for a page.
+
+    When page is given and its hero is a local image looked up in
+    image_catalog, the page is recorded as depending on the catalog.
+
+    Returns a dict with:
+      'lcp_image': the image of the first <section> in <main> (its inline
+                   background-image or first <img>), which is the hero and
+                   the likely LCP element, or None. A local image missing
+                   from image_catalog (when given) is not preloaded.
+      'uses_style': whether the page links css/style.css (and so its fonts).
+      'origins': third-party origins of render-blocking stylesheets/scripts
+                 that have no preconnect outside the RESOURCE_HINTS block,
+                 as (origin, crossorigin) tuples.
+    """
+    assets = {'lcp_image': None, 'uses_style': False, 'origins': []}
+    
+    hero = re.search(r'<main[^>]*>\s*(<section\b[^>]*>)([\s\S]*?)</section>', html_content)
+    if hero:
+        url = re.search(r"""background-image:\s*url\(['"]?([^'")]+)['"]?\)""", hero.group(1))
+        if not url:
+            url = re.search(r"""<img\b[^>]*\ssrc=["']([^"']+)["']""", hero.group(2))
+        local = re.match(r'(?:\.\./)?imgs/(.+)', url.group(1)) if url else None
+        if local and image_catalog is not None:
+            if page is not None:
+                record_dependency(page, IMAGE_CATALOG_NODE)
+            if local.group(1) not in image_catalog['images']:
+                url = None
+        if url and '{{' not in url.group(1):
+            assets['lcp_image'] = url.group(1)
+    
+    head_match = re.search(r'<head>([\s\S]*?)</head>', html_content)
+    head = head_match.group(1) if head_match else ''
+    head = re.sub(re.escape(RESOURCE_HINTS_START) + r'[\s\S]*?' + re.escape(RESOURCE_HINTS_END), '', head)
+    assets['uses_style'] = re.search(r'href="(?:\.\./)?css/style\.css"', head) is not None
+    
+    existing = set(re.findall(r'<link rel="preconnect" href="([^"]+)"', head))
+    needed = []
+    for tag in re.findall(r'<link\b[^>]*rel="stylesheet"[^>]*>|<script\b[^>]*\ssrc="https?://[^"]+"[^>]*>', head):
+        url = re.search(r'(?:href|src)="(https?://[^/"]+)', tag)
+        if not url:
+            continue
+        needed.append((url.group(1), False))
+        # Google Fonts stylesheets pull the font files from a second origin
+        if url.group(1) == 'https://fonts.googleapis.com':
+            needed.append(('https://fonts.gstatic.com', True))
+    for origin, crossorigin in dict.fromkeys(needed):
+        if origin not in existing:
+            assets['origins'].append((origin, crossorigin))
+    return assets
+
+def build_resource_hints(page_assets, is_blog=False):
+    """Return the <link> tags to inject for the analyzed page assets."""
+    prefix = '../' if is_blog else ''
+    links = []
+    for origin, crossorigin in page_assets['origins']:
+        links.append(f'<link rel="preconnect" href="{origin}"{" crossorigin" if crossorigin else ""}>')
+    if page_assets['lcp_image']:
+        links.append(f'<link rel="preload" href="{page_assets["lcp_image"]}" as="image" fetchpriority="high">')
+    if page_assets['uses_style']:
+        for font in KEY_FONTS:
+            links.append(f'<link rel="preload" href="{prefix}{font}" as="font" type="font/ttf" crossorigin>')
+    return links
+
+def update_resource_hints(html_content, is_blog=False, page_assets=None, image_catalog=None, page=None):
+    """Inject preload/preconnect hints into <head> between RESOURCE_HINTS markers.
+
+    page_assets defaults to analyzing html_content itself (recording page's
+    catalog dependency); the streaming path passes an analysis of the page
+    prefix because it only sees <head> here.
+    """
+    if page_assets is None:
+        page_assets = analyze_page_assets(html_content, image_catalog, page)
+    links = build_resource_hints(page_assets, is_blog)
+    
+    block = f"    {RESOURCE_HINTS_START}\n"
+    for link in links:
+        block += f"    {link}\n"
+    block += f"    {RESOURCE_HINTS_END}\n"
+    
+    existing_pattern = r'[ \t]*' + re.escape(RESOURCE_HINTS_START) + r'[\s\S]*?' + re.escape(RESOURCE_HINTS_END) + r'\n?'
+    if re.search(existing_pattern, html_content):
+        new_content = re.sub(existing_pattern, lambda _: block, html_content, count=1)
+    elif links:
+        # Hints go right after the viewport meta so they precede the stylesheets
+        anchor = re.search(r'<meta name="viewport"[^>]*>\n', html_content) or re.search(r'<head>\n', html_content)
+        if not anchor:
+            return html_content, False
+        new_content = html_content[:anchor.end()] + block + html_content[anchor.end():]
+    else:
+        return html_content, False
+    return new_content, new_content != html_content
+
+# ==========================================
+# Autocollimator Posters
+# ==========================================
+
+# The scene renderers follow draw() and the ExperimentLib helpers statement by
+# statement, so a change to the geometry in js/ needs the same change here.
+
+def _svg_num(value):
+    text = f"{value:.2f}".rstrip('0').rstrip('.')
+    return '0' if text == '-0' else text
+
+def _svg_line(x1, y1, x2, y2, stroke, width=1, dash=None):
+    dash_attr = f' stroke-dasharray="{dash}"' if dash else ''
+    return (f'<line x1="{_svg_num(x1)}" y1="{_svg_num(y1)}" x2="{_svg_num(x2)}" y2="{_svg_num(y2)}" '
+            f'stroke="{stroke}" stroke-width="{_svg_num(width)}"{dash_attr}/>')
+
+def _svg_rect(x, y, w, h, fill):
+    return f'<rect x="{_svg_num(x)}" y="{_svg_num(y)}" width="{_svg_num(w)}" height="{_svg_num(h)}" fill="{fill}"/>'
+
+def _svg_text(text, x, y, fill=EXPERIMENT_COLORS['WHITE'], center=False):
+    anchor = ' text-anchor="middle"' if center else ''
+    return f'<text x="{_svg_num(x)}" y="{_svg_num(y)}" fill="{fill}"{anchor}>{text}</text>'
+
+def _svg_star(cx, cy, spikes, outer_radius, inner_radius, color):
+    """ExperimentLib.drawStar()"""
+    rot = math.pi / 2 * 3
+    step = math.pi / spikes
+    points = [(cx, cy - outer_radius)]
+    for _ in range(spikes):
+        points.append((cx + math.cos(rot) * outer_radius, cy + math.sin(rot) * outer_radius))
+        rot += step
+        points.append((cx + math.cos(rot) * inner_radius, cy + math.sin(rot) * inner_radius))
+        rot += step
+    coords = ' '.join(f"{_svg_num(x)},{_svg_num(y)}" for x, y in points)
+    return f'<polygon points="{coords}" fill="{color}"/>'
+
+def _svg_eye(x, y):
+    """ExperimentLib.drawEye()"""
+    white = EXPERIMENT_COLORS['WHITE']
+    retina_x = x - 25
+    return [
+        _svg_line(retina_x, y, x + 10, y - 25, white, 2),
+        _svg_line(retina_x, y, x + 10, y + 25, white, 2),
+        f'<ellipse cx="{_svg_num(x)}" cy="{_svg_num(y)}" rx="5" ry="15" fill="none" stroke="{white}" stroke-width="2"/>',
+        _svg_text("Eye", retina_x - 5, y + 45),
+    ]
+
+def _svg_lens(x, y, height, label=None):
+    """ExperimentLib.drawLens(); the glass fill is painted over the outline, as on the canvas."""
+    elements = [
+        f'<ellipse cx="{_svg_num(x)}" cy="{_svg_num(y)}" rx="6" ry="{_svg_num(height / 2)}" '
+        f'fill="{EXPERIMENT_COLORS["LENS_GLASS"]}" stroke="{EXPERIMENT_COLORS["WHITE"]}" '
+        f'stroke-width="1.5" paint-order="stroke"/>'
+    ]
+    if label:
+        elements.append(_svg_text(label, x - 15, y - (height / 2 + 15)))
+    return elements
+
+def _svg_reticle(x, y):
+    """ExperimentLib.drawReticle()"""
+    white = EXPERIMENT_COLORS['WHITE']
+    elements = [_svg_line(x, y - 50, x, y + 50, white, 2)]
+    for i in range(-40, 41, 10):
+        elements.append(_svg_line(x - 3, y + i, x + 3, y + i, white))
+    elements.append(_svg_text("Reticle", x - 20, y - 60))
+    return elements
+
+def _svg_mirror(x, y, angle_rad):
+    """The tilted mirror body and label drawn by both scenes."""
+    return [
+        f'<g transform="translate({_svg_num(x)} {_svg_num(y)}) rotate({_svg_num(math.degrees(angle_rad))})">',
+        '    ' + _svg_rect(-3, -80, 6, 160, EXPERIMENT_COLORS['WHITE']),
+        '    ' + _svg_text("Mirror", 0, 100, center=True),
+        '</g>',
+    ]
+
+def render_source_scene(width, height, tilt_deg=0.0, source_offset=0.0, id_prefix='source'):
+    """Scene of js/autocollimator-source.js: point source, reticle and eye.
+
+    id_prefix keeps the clip path id unique when a page embeds the scene twice.
+    """
+    white, green = EXPERIMENT_COLORS['WHITE'], EXPERIMENT_COLORS['GREEN']
+    center_y = height / 2 + 30
+    eye_lens_x, eyepiece_x, reticle_x = 100, 220, 300
+    beamsplitter_x, objective_x, mirror_x = 450, 680, 900
+    obj_focal_length = objective_x - reticle_x
+    source_y = center_y - 150
+    angle_rad = math.radians(tilt_deg)
+    
+    elements = [_svg_line(eye_lens_x, center_y, mirror_x, center_y, EXPERIMENT_COLORS['AXIS'], dash='5 5')]
+    elements += _svg_eye(eye_lens_x, center_y)
+    elements += _svg_lens(eyepiece_x, center_y, 150, "Lens")
+    elements += _svg_reticle(reticle_x, center_y)
+    elements += _svg_lens(objective_x, center_y, 200, "Lens")
+    elements.append(_svg_line(beamsplitter_x - 40, center_y - 40, beamsplitter_x + 40, center_y + 40,
+                              EXPERIMENT_COLORS['BEAMSPLITTER'], 3))
+    elements.append(_svg_text("Beamsplitter", beamsplitter_x - 45, center_y + 65))
+    
+    drawn_source_x = beamsplitter_x + source_offset
+    elements.append(_svg_star(drawn_source_x, source_y, 4, 6, 2, green))
+    elements.append(_svg_text("Source Point", drawn_source_x - 45, source_y - 15))
+    
+    # Outgoing rays: virtual source -> beamsplitter -> objective edges -> mirror
+    obj_top_y, obj_bot_y = center_y - 35, center_y + 35
+    vs_x, vs_y = reticle_x, center_y + source_offset
+    bs_intercept = center_y - beamsplitter_x
+    
+    def bs_intersection(target_x, target_y):
+        dx, dy = target_x - vs_x, target_y - vs_y
+        if abs(dy - dx) < 0.001:
+            return beamsplitter_x, center_y
+        t = (vs_x + bs_intercept - vs_y) / (dy - dx)
+        return vs_x + t * dx, vs_y + t * dy
+    
+    hit_top = bs_intersection(objective_x, obj_top_y)
+    hit_bot = bs_intersection(objective_x, obj_bot_y)
+    elements.append(_svg_line(drawn_source_x, source_y, *hit_top, white))
+    elements.append(_svg_line(drawn_source_x, source_y, *hit_bot, white))
+    elements.append(_svg_line(*hit_top, objective_x, obj_top_y, white))
+    elements.append(_svg_line(*hit_bot, objective_x, obj_bot_y, white))
+    
+    dist_obj_mirror = mirror_x - objective_x
+    ray_angle = math.atan(-source_offset / obj_focal_length)
+    mir_top_y = obj_top_y + dist_obj_mirror * math.tan(ray_angle)
+    mir_bot_y = obj_bot_y + dist_obj_mirror * math.tan(ray_angle)
+    elements.append(_svg_line(objective_x, obj_top_y, mirror_x, mir_top_y, white))
+    elements.append(_svg_line(objective_x, obj_bot_y, mirror_x, mir_bot_y, white))
+    elements += _svg_mirror(mirror_x, center_y, angle_rad)
+    
+    # Return rays: mirror -> objective -> focus on the reticle -> eyepiece -> eye
+    reflected_angle = 2 * angle_rad - ray_angle
+    ret_top_y = mir_top_y + (objective_x - mirror_x) * math.tan(reflected_angle)
+    ret_bot_y = mir_bot_y + (objective_x - mirror_x) * math.tan(reflected_angle)
+    elements.append(_svg_line(mirror_x, mir_top_y, objective_x, ret_top_y, green))
+    elements.append(_svg_line(mirror_x, mir_bot_y, objective_x, ret_bot_y, green))
+    
+    h = obj_focal_length * math.tan(reflected_angle)
+    focus_y = center_y + h
+    elements.append(_svg_line(objective_x, ret_top_y, reticle_x, focus_y, green))
+    elements.append(_svg_line(objective_x, ret_bot_y, reticle_x, focus_y, green))
+    
+    slope_top = (focus_y - ret_top_y) / (reticle_x - objective_x)
+    slope_bot = (focus_y - ret_bot_y) / (reticle_x - objective_x)
+    ep_top_y = focus_y + slope_top * (eyepiece_x - reticle_x)
+    ep_bot_y = focus_y + slope_bot * (eyepiece_x - reticle_x)
+    elements.append(_svg_line(reticle_x, focus_y, eyepiece_x, ep_top_y, green))
+    elements.append(_svg_line(reticle_x, focus_y, eyepiece_x, ep_bot_y, green))
+    eye_pupil_spread = 7
+    elements.append(_svg_line(eyepiece_x, ep_top_y, eye_lens_x, center_y + eye_pupil_spread, green))
+    elements.append(_svg_line(eyepiece_x, ep_bot_y, eye_lens_x, center_y - eye_pupil_spread, green))
+    
+    # Reticle view overlay (drawReticleView)
+    view_x, view_y, view_r = 250, 100, 45
+    elements += [
+        f'<clipPath id="{id_prefix}ReticleView"><circle cx="{view_x}" cy="{view_y}" r="{view_r}"/></clipPath>',
+        f'<g clip-path="url(#{id_prefix}ReticleView)">',
+        f'    <circle cx="{view_x}" cy="{view_y}" r="{view_r}" fill="#00102b"/>',
+        '    ' + _svg_line(view_x - view_r, view_y, view_x + view_r, view_y, 'rgba(255,255,255,0.3)'),
+        '    ' + _svg_line(view_x, view_y - view_r, view_x, view_y + view_r, 'rgba(255,255,255,0.3)'),
+        '    ' + _svg_star(view_x, view_y + h * 0.9, 4, 4, 1.5, green),
+        '</g>',
+        f'<circle cx="{view_x}" cy="{view_y}" r="{view_r}" fill="none" stroke="{white}" stroke-width="2"/>',
+        _svg_text("Reticle View", view_x, view_y - 55, center=True),
+    ]
+    return elements
+
+def render_sla_scene(width, height, tilt_deg=0.0, source_offset=0.0, id_prefix='sla'):
+    """Scene of js/autocollimator-sla.js: micro display, aperture stop and sensor."""
+    white, green = EXPERIMENT_COLORS['WHITE'], EXPERIMENT_COLORS['GREEN']
+    center_y = height / 2 + 30
+    eye_lens_x, eyepiece_x, reticle_x = 100, 220, 300
+    beamsplitter_x, objective_x, mirror_x = 450, 680, 900
+    obj_focal_length = objective_x - reticle_x
+    dist_obj_mirror = mirror_x - objective_x
+    source_y = center_y - 150
+    angle_rad = math.radians(tilt_deg)
+    
+    elements = [_svg_line(eye_lens_x, center_y, mirror_x, center_y, EXPERIMENT_COLORS['AXIS'], dash='5 5')]
+    elements.append(_svg_line(eye_lens_x, center_y - 30, eye_lens_x, center_y + 30, white, 4))
+    elements.append(_svg_text("Sensor", eye_lens_x - 20, center_y + 50))
+    elements += _svg_lens(eyepiece_x, center_y, 150, "Lens")
+    
+    # Aperture stop: two blocks with a gap on the axis
+    ap_width, ap_height, gap = 4, 50, 1
+    elements.append(_svg_rect(reticle_x - ap_width / 2, center_y - gap - ap_height, ap_width, ap_height, '#FFFFFF'))
+    elements.append(_svg_rect(reticle_x - ap_width / 2, center_y + gap, ap_width, ap_height, '#FFFFFF'))
+    elements.append(_svg_text("Aperture", reticle_x - 25, center_y + 70))
+    
+    elements += _svg_lens(objective_x, center_y, 200, "Lens")
+    elements.append(_svg_line(beamsplitter_x - 40, center_y - 40, beamsplitter_x + 40, center_y + 40,
+                              EXPERIMENT_COLORS['BEAMSPLITTER'], 3))
+    elements.append(_svg_text("Beamsplitter", beamsplitter_x - 45, center_y + 65))
+    
+    # Micro display with its active pixel
+    drawn_source_x = beamsplitter_x + source_offset
+    elements.append(_svg_rect(beamsplitter_x - 45, source_y - 4, 90, 8, '#000000'))
+    elements.append(_svg_rect(drawn_source_x - 3, source_y - 3, 6, 6, green))
+    elements.append(_svg_text("Micro Display", beamsplitter_x - 45, source_y - 25))
+    
+    # Outgoing ray: pixel -> beamsplitter -> objective -> mirror center
+    bs_hit_y = drawn_source_x - beamsplitter_x + center_y
+    elements.append(_svg_line(drawn_source_x, source_y, drawn_source_x, bs_hit_y, white))
+    elements.append(_svg_line(drawn_source_x, bs_hit_y, objective_x, bs_hit_y, white))
+    ray_angle = math.atan((center_y - bs_hit_y) / dist_obj_mirror)
+    elements.append(_svg_line(objective_x, bs_hit_y, mirror_x, center_y, white))
+    elements += _svg_mirror(mirror_x, center_y, angle_rad)
+    
+    # Return ray: mirror -> objective -> aperture, and on to the sensor if it passes
+    reflected_angle = 2 * angle_rad - ray_angle
+    return_obj_y = center_y + (objective_x - mirror_x) * math.tan(reflected_angle)
+    elements.append(_svg_line(mirror_x, center_y, objective_x, return_obj_y, green))
+    h = obj_focal_length * math.tan(reflected_angle)
+    focus_y = center_y + h
+    elements.append(_svg_line(objective_x, return_obj_y, reticle_x, focus_y, green))
+    
+    is_hit = abs(h) <= gap
+    if is_hit:
+        slope = (focus_y - return_obj_y) / (reticle_x - objective_x)
+        ep_hit_y = focus_y + slope * (eyepiece_x - reticle_x)
+        sensor_hit_y = ep_hit_y + slope * (eye_lens_x - eyepiece_x)
+        elements.append(f'<polyline points="{_svg_num(reticle_x)},{_svg_num(focus_y)} '
+                        f'{_svg_num(eyepiece_x)},{_svg_num(ep_hit_y)} {_svg_num(eye_lens_x)},{_svg_num(sensor_hit_y)}" '
+                        f'fill="none" stroke="{green}" stroke-width="1"/>')
+    
+    # Sensor view overlay (drawSensorView)
+    view_x, view_y, view_w, view_h = 250, 100, 80, 60
+    elements += [
+        f'<rect x="{_svg_num(view_x - view_w / 2)}" y="{_svg_num(view_y - view_h / 2)}" width="{view_w}" '
+        f'height="{view_h}" fill="{"#FFFFFF" if is_hit else "#000000"}" stroke="#FFFFFF" stroke-width="2"/>',
+        _svg_text("Sensor View", view_x, view_y - 45, '#FFFFFF', center=True),
+    ]
+    return elements
+
+POSTER_RENDERERS = {
+    'source': render_source_scene,
+    'sla': render_sla_scene,
+}
+
+def render_poster(canvas_id, indent='', instance=0):
+    """Render the default-state scene for a canvas in POSTER_SCENES as inline SVG."""
+    scene, width, height = POSTER_SCENES[canvas_id]
+    id_prefix = f"{canvas_id}Poster{instance}"
+    lines = [
+        f'<svg class="autocollimator-poster" viewBox="0 0 {width} {height}" width="{width}" height="{height}" '
+        f'font-family="Montserrat" font-size="14" role="img" aria-label="Autocollimator diagram">'
+    ]
+    lines += [f'    {element}' for element in POSTER_RENDERERS[scene](width, height, id_prefix=id_prefix)]
+    lines.append('</svg>')
+    return '\n'.join(indent + line for line in lines)
+
+def update_posters(html_content, rendered=None):
+    """Render every POSTER_START <canvas id> ... POSTER_END block in the page.
+
+    The canvas id of each rendered poster is appended to rendered, which the
+    streaming path shares across regions so repeated posters get unique ids.
+    """
+    pattern = (r'([ \t]*)' + re.escape(POSTER_START.format('@')).replace('@', r'(\w+)')
+               + r'\n[\s\S]*?' + re.escape(POSTER_END))
+    if rendered is None:
+        rendered = []
+    
+    def replace_poster(match):
+        indent, canvas_id = match.group(1), match.group(2)
+        if canvas_id not in POSTER_SCENES:
+            print(f"Warning: no poster scene configured for canvas '{canvas_id}'")
+            return match.group(0)
+        poster = render_poster(canvas_id, indent, rendered.count(canvas_id))
+        rendered.append(canvas_id)
+        return f"{indent}{POSTER_START.format(canvas_id)}\n{poster}\n{indent}{POSTER_END}"
+    
+    new_content = re.sub(pattern, replace_poster, html_content)
+    return new_content, new_content != html_content
+
+# ==========================================
+# Streaming HTML Processing
+# ==========================================
+
+# Regions the streaming updater hands to the regular transforms, as
+# (kind, start token, end token). Everything outside a region is copied through.
+STREAM_REGIONS = [
+    ('head', '<head>', '</head>'),
+    ('header', '<header', '</header>'),
+    ('footer', '<footer>', '</footer>'),
+    ('placeholder', '<div class="image-placeholder"', '</div>'),
+    ('partners', '<!-- PARTNERS_START -->', '<!-- PARTNERS_END -->'),
+    ('poster', POSTER_START.split('{}')[0], POSTER_END),
+]
+
+def iter_html_regions(f, kinds, chunk_size=STREAM_CHUNK_SIZE, max_lookahead=STREAM_MAX_LOOKAHEAD):
+    """Split a file object into (kind, text) pieces using bounded lookahead.
+
+    kind is one of the STREAM_REGIONS kinds for a complete region, or None for
+    text that is passed through untouched. At most max_lookahead characters
+    are buffered while searching for the end of a region; a region that does
+    not close within that window is passed through unchanged.
+    """
+    regions = [r for r in STREAM_REGIONS if r[0] in kinds]
+    holdback = max(len(start) for _, start, _ in regions) - 1
+    buf = f.read(chunk_size)
+    eof = not buf
+
+    while buf:
+        # Earliest region start in the buffer
+        found = None
+        for kind, start, end in regions:
+            idx = buf.find(start)
+            if idx != -1 and (found is None or idx < found[0]):
+                found = (idx, kind, start, end)
+
+        if found is None:
+            if eof:
+                yield None, buf
+                return
+            # Keep a possible partial start token plus any trailing indentation,
+            # which belongs to a header/footer that may start in the next chunk
+            cut = max(len(buf) - holdback, 0)
+            while cut > 0 and buf[cut - 1] in ' \t' and len(buf) - cut < max_lookahead:
+                cut -= 1
+            if cut:
+                yield None, buf[:cut]
+                buf = buf[cut:]
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf += chunk
+            continue
+
+        idx, kind, start, end = found
+        # The header/footer/poster patterns also consume indentation before the tag
+        region_start = idx
+        if kind in ('header', 'footer', 'poster'):
+            while region_start > 0 and buf[region_start - 1] in ' \t':
+                region_start -= 1
+        if region_start:
+            yield None, buf[:region_start]
+            buf = buf[region_start:]
+        search_from = idx - region_start + len(start)
+
+        end_idx = buf.find(end, search_from)
+        while end_idx == -1 and not eof and len(buf) < max_lookahead:
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            # Re-scan only the tail that could contain the end token
+            rescan = max(len(buf) - len(end) + 1, search_from)
+            buf += chunk
+            end_idx = buf.find(end, rescan)
+
+        if end_idx == -1:
+            if not eof:
+                print(f"Warning: {kind} region exceeds {max_lookahead} characters, leaving it unchanged")
+            yield None, buf[:search_from]
+            buf = buf[search_from:]
+        else:
+            end_idx += len(end)
+            yield kind, buf[:end_idx]
+            buf = buf[end_idx:]
+
+        if not buf and not eof:
+            buf = f.read(chunk_size)
+            eof = not buf
+
+# Build graph inputs behind each streamed region kind
+STREAM_REGION_NODES = {
+    'header': HEADER_NODE,
+    'footer': FOOTER_NODE,
+    'partners': IMAGE_CATALOG_NODE,
+}
+
+def stream_update_html_file(html_path, image_catalog, dry_run=False, update_common=True,
+                            chunk_size=STREAM_CHUNK_SIZE):
+    """Streaming variant of update_html_file().
+
+    Reads the page in chunk_size chunks and applies the same transforms
+    region by region, so peak memory is bounded by the largest header, footer,
+    placeholder or partners block rather than by the page size. Output goes to
+    a temporary file that replaces the original only if something changed.
+    """
+    common_updates = []
+    conversion_updates = []
+    partner_updates = []
+    placeholder_updates = []
+    changed = set()
+    posters = []
+    
+    is_blog, is_index = _page_flags(html_path)
+    # Header, footer and partners regions are always found so that their
+    # template edges are recorded, but only updated with update_common
+    kinds = {'placeholder', 'poster', 'header', 'footer'}
+    if is_index:
+        kinds.add('partners')
+    if update_common:
+        kinds.add('head')
+    # Resource hints in <head> depend on the hero section further down;
+    # the head, header and hero all sit within the first lookahead window.
+    # The hero is analyzed with its placeholders resolved, as the whole-file
+    # path sees it.
+    with open_output(html_path) as f:
+        prefix = f.read(STREAM_MAX_LOOKAHEAD)
+    prefix, _ = convert_background_to_img(prefix)
+    prefix, _ = update_placeholders(prefix, html_path, image_catalog, is_blog, warn=False)
+    page_assets = analyze_page_assets(prefix, image_catalog, html_path)
+    
+    # Inside virtual_outputs() the result is collected in memory instead
+    virtual = _virtual_outputs is not None
+    to_disk = not virtual and not dry_run
+    tmp_path = html_path.with_name(html_path.name + '.tmp')
+    if virtual:
+        out = io.StringIO()
+    else:
+        out = open(tmp_path if to_disk else os.devnull, 'w', encoding='utf-8')
+    try:
+        with open_output(html_path) as f:
+            for kind, text in iter_html_regions(f, kinds, chunk_size):
+                if kind == 'placeholder':
+                    new_text, converted = convert_background_to_img(text)
+                    if converted:
+                        changed.add('conversion')
+                    if find_placeholders(new_text):
+                        record_dependency(html_path, IMAGE_CATALOG_NODE)
+                    new_text, updates = update_placeholders(new_text, html_path, image_catalog, is_blog)
+                    placeholder_updates.extend(updates)
+                elif kind == 'poster':
+                    rendered = len(posters)
+                    new_text, updated = update_posters(text, posters)
+                    record_poster_dependencies(html_path, posters[rendered:])
+                    if updated:
+                        changed.add('posters')
+                elif kind in ('head', 'footer', 'header', 'partners'):
+                    if kind in STREAM_REGION_NODES:
+                        record_dependency(html_path, STREAM_REGION_NODES[kind])
+                    if not update_common:
+                        new_text, updated = text, False
+                    elif kind == 'head':
+                        new_text, updated = update_resource_hints(text, is_blog, page_assets)
+                        kind = 'hints'
+                    elif kind == 'footer':
+                        new_text, updated = update_footer(text, is_blog)
+                    elif kind == 'header':
+                        new_text, updated = update_header(text, is_blog, is_index)
+                    else:
+                        new_text, updated = update_partners_section(text, image_catalog)
+                    if updated:
+                        changed.add(kind)
+                else:
+                    new_text = text
+                if new_text != text:
+                    changed.add('content')
+                out.write(new_text)
+        if virtual:
+            write_output(html_path, out.getvalue())
+    except BaseException:
+        if to_disk:
+            tmp_path.unlink(missing_ok=True)
+        raise
+    finally:
+        out.close()
+    
+    if to_disk:
+        if 'content' in changed:
+            os.replace(tmp_path, html_path)
+        else:
+            tmp_path.unlink()
+    
+    if 'conversion' in changed:
+        conversion_updates.append(_update_record(html_path, 'conversion'))
+    for kind in ('posters', 'footer', 'header', 'hints'):
+        if kind in changed:
+            common_updates.append(_update_record(html_path, kind))
+    if 'partners' in changed:
+        partner_updates.append(_update_record(html_path, 'partners'))
+    # The whole-file path collects placeholders last-to-first
+    placeholder_updates.reverse()
+    
+    return placeholder_updates, common_updates, conversion_updates, partner_updates
+
+def run_update_placeholders(dry_run=False, skip_common=False, stream=False):
+    print("\n=== Updating Placeholders & Common Elements ===\n")
+    if stream:
+        print("--- STREAMING MODE - Pages are processed in bounded memory ---\n")
+    
+    print("Scanning for images...")
+    image_catalog = get_image_catalog()
+    print(f"Found {len(image_catalog['images'])} images in imgs folder\n")
+    
+    all_placeholder_updates = []
+    all_common_updates = []
+    all_conversion_updates = []
+    all_partner_updates = []
+    
+    # Populate HTML_FILES dynamically
+    print("Scanning for HTML files...")
+    html_files_found = []
+    
+    # Scan root directory
+    for file_path in output_glob(SCRIPT_DIR, "*.html"):
+        if file_path.name == "blog.html": # handled by build_blog.py mostly, but we might want to update common elements
+            pass 
+        html_files_found.append(file_path)
+        
+    print(f"Found {len(html_files_found)} HTML files in root.")
+
+    # Also check blog folder
+    blog_dir = SCRIPT_DIR / "blog"
+    if blog_dir.exists():
+        html_files_found.extend(output_glob(blog_dir, "*.html"))
+    
+    # Pages are independent of each other, so they are updated in parallel
+    results = run_parallel(
+        lambda html_path: update_html_file(html_path, image_catalog, dry_run, not skip_common, stream),
+        html_files_found
+    )
+    for placeholder_updates, common_updates, conversion_updates, partner_updates in results:
+        all_placeholder_updates.extend(placeholder_updates)
+        all_common_updates.extend(common_updates)
+        all_conversion_updates.extend(conversion_updates)
+        all_partner_updates.extend(partner_updates)
+    
+    # Report results
+    if all_conversion_updates:
+        print("\nImage format conversions:" if not dry_run else "\nImage format conversions that would be made:")
+        print("-" * 60)
+        for update in all_conversion_updates:
+            print(f"  {update['file']}: {update['description']}")
+        print(f"Total: {len(all_conversion_updates)} file(s) converted")
+    
+    if all_placeholder_updates:
+        print("\nPlaceholder updates:" if not dry_run else "\nPlaceholder updates that would be made:")
+        print("-" * 60)
+        for update in all_placeholder_updates:
+            print(f"  {update['file']}: {update['placeholder']} -> {update['image']}")
+        print(f"Total: {len(all_placeholder_updates)} placeholder(s)")
+    else:
+        print("\nNo placeholders found with matching images.")
+    
+    if all_common_updates:
+        print("\nCommon element updates:" if not dry_run else "\nCommon element updates that would be made:")
+        print("-" * 60)
+        for update in all_common_updates:
+            print(f"  {update['file']}: {update['type']} - {update['description']}")
+        print(f"Total: {len(all_common_updates)} common element(s) updated")
+    elif not skip_common:
+        print("\nNo common element updates needed.")
+    
+    if all_partner_updates:
+        print("\nPartner section updates:" if not dry_run else "\nPartner section updates that would be made:")
+        print("-" * 60)
+        for update in all_partner_updates:
+            print(f"  {update['file']}: {update['description']}")
+        print(f"Total: {len(all_partner_updates)} partner section(s) updated")
+
+    if not all_placeholder_updates and not all_common_updates and not all_conversion_updates and not all_partner_updates:
+        print("No updates were needed.")
+
+# ==========================================
+# Service Worker
+# ==========================================
+
+def _content_revision(path):
+    if _virtual_outputs is not None and path in _virtual_outputs:
+        return hashlib.sha256(_virtual_outputs[path].encode('utf-8')).hexdigest()[:16]
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+def collect_precache_entries(image_catalog):
+    """Return the precache manifest: [{'url', 'revision'}] for the site shell.
+
+    Covers the public root HTML pages, css/style.css, js/*.js and the images
+    referenced by STANDARD_HEADER. Revisions are content hashes, taken from the
+    image catalog for images.
+    """
+    paths = [p for p in output_glob(SCRIPT_DIR, '*.html') if p.name not in PRECACHE_EXCLUDE]
+    paths.append(SCRIPT_DIR / 'css' / 'style.css')
+    paths.extend(sorted((SCRIPT_DIR / 'js').glob('*.js')))
+    
+    entries = []
+    for path in paths:
+        if output_exists(path):
+            entries.append({'url': path.relative_to(SCRIPT_DIR).as_posix(), 'revision': _content_revision(path)})
+    
+    nav_images = re.findall(r"""(?:src="|url\(')imgs/([^"']+)""", STANDARD_HEADER)
+    for rel_name in dict.fromkeys(nav_images):
+        entry = image_catalog['images'].get(rel_name)
+        if entry:
+            entries.append({'url': f"imgs/{rel_name}", 'revision': entry['hash'][:16]})
+        else:
+            print(f"Warning: header image imgs/{rel_name} not found, not precaching it")
+    return entries
+
+def generate_service_worker(entries, blog_pages):
+    manifest = json.dumps(entries, indent=4)
+    pages = json.dumps(sorted(blog_pages))
+    version = hashlib.sha256((SERVICE_WORKER_TEMPLATE + manifest + pages).encode('utf-8')).hexdigest()[:12]
+    
+    output = SERVICE_WORKER_TEMPLATE.replace('{{ version }}', version)
+    output = output.replace('{{ manifest }}', manifest)
+    output = output.replace('{{ blog_pages }}', pages)
+    return output, version
+
+def run_build_service_worker(dry_run=False):
+    print("\n=== Building Service Worker ===\n")
+    entries = collect_precache_entries(get_image_catalog())
+    blog_pages = {'blog.html'}
+    blog_pages.update(p.with_suffix('.html').name for p in POSTS_DIR.glob('*.md'))
+    
+    output, version = generate_service_worker(entries, blog_pages)
+    for entry in entries:
+        record_dependency(SERVICE_WORKER_FILE, SCRIPT_DIR / entry['url'])
+    print(f"Precache manifest: {len(entries)} entries, version {version}")
+    
+    current = read_output(SERVICE_WORKER_FILE) if output_exists(SERVICE_WORKER_FILE) else None
+    if output == current:
+        print(f"{SERVICE_WORKER_FILE.name} is up to date")
+    else:
+        print(f"Would update {SERVICE_WORKER_FILE}" if dry_run else f"Saved {SERVICE_WORKER_FILE}")
+    # In memory every output is recorded, changed or not
+    if output != current or _virtual_outputs is not None:
+        write_output(SERVICE_WORKER_FILE, output, dry_run)
+
+# ==========================================
+# Build Graph
+# ==========================================
+
+def node_name(path):
+    """Graph node name for a file: its path relative to the site root.
+
+    Relative paths are taken from the site root. Raises ValueError for a
+    path that leaves it.
+    """
+    path = Path(os.path.abspath(SCRIPT_DIR / path))
+    try:
+        return path.relative_to(SCRIPT_DIR).as_posix()
+    except ValueError:
+        raise ValueError(f"{path} is outside the site root") from None
+
+def _partial_hashes():
+    """Content hashes of the templates that live in this script."""
+    def digest(*parts):
+        return hashlib.sha256(''.join(parts).encode('utf-8')).hexdigest()[:16]
+    return {
+        HEADER_NODE: digest(STANDARD_HEADER, STANDARD_HEADER_INDEX, STANDARD_HEADER_BLOG),
+        FOOTER_NODE: digest(STANDARD_FOOTER, STANDARD_FOOTER_BLOG),
+    }
+
+def record_dependency(output, source):
+    """Record that output was rendered from source (file paths or node names)."""
+    output = node_name(output)
+    source = source if source in PARTIAL_NODES or source == IMAGE_CATALOG_NODE else node_name(source)
+    with _build_graph_lock:
+        _build_graph.setdefault(output, set()).add(source)
+
+def reset_dependencies(outputs):
+    """Forget the recorded inputs of outputs that are about to be rebuilt."""
+    with _build_graph_lock:
+        for output in outputs:
+            _build_graph.pop(output, None)
+
+def load_build_graph():
+    """Load the graph recorded by the last build into _build_graph.
+
+    Returns the partial hashes it was recorded with, or None if there is no
+    usable graph. Post pages and blog.html always get their edges from the
+    posts on disk, so new posts are picked up without a recorded build.
+    """
+    if not BUILD_GRAPH_CACHE.exists():
+        return None
+    try:
+        with open(BUILD_GRAPH_CACHE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get('version') != BUILD_GRAPH_VERSION:
+        return None
+    
+    with _build_graph_lock:
+        _build_graph.clear()
+        for output, sources in cached['deps'].items():
+            _build_graph[output] = set(sources)
+    for filename in glob.glob(os.path.join(POSTS_DIR, '*.md')):
+        record_dependency(SCRIPT_DIR / Path(filename).with_suffix('.html').name, filename)
+        record_dependency(SCRIPT_DIR / Path(filename).with_suffix('.html').name, TEMPLATE_FILE)
+        record_dependency(BLOG_INDEX_FILE, filename)
+    return cached['partials']
+
+def save_build_graph():
+    try:
+        BUILD_GRAPH_CACHE.parent.mkdir(exist_ok=True)
+        with _build_graph_lock:
+            deps = {output: sorted(sources) for output, sources in _build_graph.items()}
+        with open(BUILD_GRAPH_CACHE, 'w', encoding='utf-8') as f:
+            json.dump({'version': BUILD_GRAPH_VERSION, 'partials': _partial_hashes(), 'deps': deps},
+                      f, indent=1, sort_keys=True)
+    except OSError as e:
+        print(f"Warning: could not write build graph: {e}")
+
+def find_dependents(nodes):
+    """Return every output that transitively depends on any of nodes."""
+    dependents = {}
+    for output, sources in _build_graph.items():
+        for source in sources:
+            dependents.setdefault(source, set()).add(output)
+    
+    found = set()
+    pending = list(nodes)
+    while pending:
+        node = pending.pop()
+        for output in dependents.get(node, ()):
+            if output not in found:
+                found.add(output)
+                pending.append(output)
+    return found
+
+def graph_nodes_for(path):
+    """Graph nodes affected by a change to a site-relative path (or pseudo-node)."""
+    if path in PARTIAL_NODES or path == IMAGE_CATALOG_NODE:
+        return {path}
+    node = node_name(SCRIPT_DIR / path)
+    nodes = {node}
+    if node.startswith(IMAGE_CATALOG_NODE):
+        # New, removed or changed images can alter any catalog lookup
+        nodes.add(IMAGE_CATALOG_NODE)
+    if node == Path(__file__).name:
+        # Templates and transforms live in the script itself
+        nodes.update(PARTIAL_NODES)
+    return nodes
+
+def is_known_target(target):
+    """Whether a build target is a file on disk or a node of the recorded graph.
+
+    Deleted inputs stay valid targets while the graph still mentions them.
+    Raises ValueError for a target outside the site root.
+    """
+    if target in PARTIAL_NODES or target == IMAGE_CATALOG_NODE:
+        return True
+    node = node_name(target)
+    if (SCRIPT_DIR / node).exists():
+        return True
+    if not _build_graph:
+        load_build_graph()
+    return node in _build_graph or any(node in sources for sources in _build_graph.values())
+
+def check_revision(rev):
+    """Raise ValueError unless rev names a commit in the site's git repository."""
+    import subprocess
+    
+    # A leading '-' would reach git as an option
+    if not rev or rev.startswith('-'):
+        raise ValueError(f"Invalid git revision: {rev!r}")
+    result = subprocess.run(['git', 'rev-parse', '--verify', '--quiet', '--end-of-options', f'{rev}^{{commit}}'],
+                            cwd=SCRIPT_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise ValueError(f"Unknown git revision: {rev!r}")
+
+def changed_since(rev):
+    """Graph nodes for files changed since a git revision (including uncommitted and untracked files)."""
+    import subprocess
+    
+    def git(*args):
+        return subprocess.run(['git', *args], cwd=SCRIPT_DIR, capture_output=True, text=True, check=True).stdout.split('\n')
+    
+    paths = git('diff', '--name-only', '--end-of-options', rev, '--') + git('ls-files', '--others', '--exclude-standard')
+    nodes = set()
+    for path in filter(None, paths):
+        nodes |= graph_nodes_for(path)
+    return nodes
+
+def run_parallel(func, items):
+    """Apply func to items on a thread pool, returning results in order."""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    items = list(items)
+    if len(items) < 2:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=BUILD_WORKERS) as executor:
+        return list(executor.map(func, items))
+
+def schedule_build(nodes, deps, action):
+    """Run action(node) for each node once all of its dependencies in nodes are done.
+
+    deps maps each node to its inputs. Nodes whose dependencies are satisfied
+    run in parallel on a thread pool.
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+    
+    waiting = {node: (deps.get(node, set()) & nodes) - {node} for node in nodes}
+    running = {}
+    with ThreadPoolExecutor(max_workers=BUILD_WORKERS) as executor:
+        while waiting or running:
+            for node in sorted(n for n, deps in waiting.items() if not deps):
+                del waiting[node]
+                running[executor.submit(action, node)] = node
+            if not running:
+                raise RuntimeError(f"Dependency cycle between: {', '.join(sorted(waiting))}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = running.pop(future)
+                future.result()
+                for deps in waiting.values():
+                    deps.discard(node)
+
+def rebuild_node(node, template, image_catalog, dry_run=False, skip_common=False, stream=False):
+    """Rebuild a single output node of the build graph."""
+    path = SCRIPT_DIR / node
+    if node == node_name(SERVICE_WORKER_FILE):
+        run_build_service_worker(dry_run)
+        return
+    
+    post = POSTS_DIR / Path(node).with_suffix('.md').name
+    if path.parent == SCRIPT_DIR and post.exists():
+        build_post(str(post), template)
+    elif path == BLOG_INDEX_FILE:
+        posts = collect_post_metadata()
+        update_blog_index(posts)
+        for post in posts:
+            record_dependency(BLOG_INDEX_FILE, POSTS_DIR / post['filename'])
+    
+    if path.suffix == '.html' and output_exists(path):
+        updates = update_html_file(path, image_catalog, dry_run, not skip_common, stream)
+        for update in (u for group in updates for u in group):
+            print(f"  {update['file']}: {update['type']}")
+
+def run_targeted_build(targets, since=None, dry_run=False, skip_common=False, stream=False,
+                       template=None, image_catalog=None, check_targets=True):
+    """Rebuild the named targets (and/or files changed since a git rev) plus their dependents.
+
+    Returns the set of rebuilt outputs, or None if no build graph has been
+    recorded yet, in which case a full build is needed first. template and
+    image_catalog may be passed in by a caller that keeps them loaded.
+    Raises ValueError for a target outside the site root, for a since that is
+    not a git commit, and for a target that is neither on disk nor in the
+    graph unless check_targets is False (for targets found by scanning).
+    """
+    print("\n=== Targeted Build ===\n")
+    recorded_partials = load_build_graph()
+    unknown = [target for target in targets if check_targets and not is_known_target(target)]
+    if unknown:
+        raise ValueError(f"Unknown target(s), neither on disk nor in the build graph: {', '.join(unknown)}")
+    if since:
+        check_revision(since)
+    if recorded_partials is None:
+        print("No build graph recorded yet; running a full build.")
+        return None
+    
+    changed = set()
+    for target in targets:
+        changed |= graph_nodes_for(target)
+    if since:
+        changed |= changed_since(since)
+    # A template edited since the graph was recorded invalidates its pages too
+    current_partials = _partial_hashes()
+    changed |= {name for name in PARTIAL_NODES if recorded_partials.get(name) != current_partials[name]}
+    
+    # Named outputs are rebuilt themselves; inputs only trigger their dependents
+    outputs = {node for node in changed if node in _build_graph or (SCRIPT_DIR / node).suffix == '.html'}
+    outputs |= find_dependents(changed)
+    outputs = {node for node in outputs if node not in PARTIAL_NODES and node != IMAGE_CATALOG_NODE}
+    if not outputs:
+        print("Nothing to rebuild.")
+        return outputs
+    print(f"Rebuilding {len(outputs)} output(s): {', '.join(sorted(outputs))}\n")
+    
+    if template is None:
+        template = load_template()
+    if image_catalog is None:
+        image_catalog = get_image_catalog()
+    # Order by the recorded edges, then let rendering re-record them
+    recorded = {node: set(_build_graph.get(node, ())) for node in outputs}
+    reset_dependencies(outputs)
+    schedule_build(outputs, recorded,
+                   lambda node: rebuild_node(node, template, image_catalog, dry_run, skip_common, stream))
+    
+    if not dry_run:
+        save_build_graph()
+    return outputs
+
+# ==========================================
+# Build Daemon
+# ==========================================
+
+# Warm state kept by the daemon between requests. Each entry is revalidated
+# by mtime, so edits on disk are always picked up.
+_template_cache = None
+_post_cache = {}
+_markdown_converter = None
+_markdown_lock = threading.Lock()
+_daemon_build_lock = threading.Lock()
+_source_mtimes = {}
+
+def get_template():
+    """Return the post template, re-reading it only when it changed on disk."""
+    global _template_cache
+    try:
+        mtime = TEMPLATE_FILE.stat().st_mtime_ns
+    except OSError:
+        return load_template()
+    if _template_cache is None or _template_cache[0] != mtime:
+        _template_cache = (mtime, load_template())
+    return _template_cache[1]
+
+def get_post(filepath):
+    """Return (metadata, markdown_content) for a post, cached by mtime."""
+    filepath = Path(filepath)
+    mtime = filepath.stat().st_mtime_ns
+    cached = _post_cache.get(filepath)
+    if cached is None or cached[0] != mtime:
+        metadata, markdown_content = parse_post(filepath)
+        metadata['filename'] = filepath.name
+        cached = (mtime, metadata, markdown_content)
+        _post_cache[filepath] = cached
+    return dict(cached[1]), cached[2]
+
+def render_post_preview(metadata, markdown_content):
+    """Render a post exactly as the build would, without writing anything."""
+    global _markdown_converter
+    with _markdown_lock:
+        if _markdown_converter is None:
+            import markdown
+            _markdown_converter = markdown.Markdown()
+        return generate_post_html(metadata or {}, markdown_content, get_template(), _markdown_converter)
+
+def scan_source_mtimes():
+    """mtimes of every file a build reads, keyed by graph node name."""
+    paths = list(POSTS_DIR.glob('*.md'))
+    paths += SCRIPT_DIR.glob('*.html')
+    paths += BLOG_DIR.glob('*.html')
+    paths += (SCRIPT_DIR / 'js').glob('*.js')
+    paths.append(SCRIPT_DIR / 'css' / 'style.css')
+    paths += (p for p in IMGS_DIR.rglob('*') if p.suffix.lower() in IMAGE_EXTENSIONS)
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[node_name(path)] = path.stat().st_mtime_ns
+        except OSError:
+            pass
+    return mtimes
+
+def daemon_rebuild(targets=None, since=None):
+    """Rebuild targets, files changed since a git rev, or (by default) files
+    changed on disk since the daemon last built.
+
+    Returns the rebuilt outputs, or ['*'] if a full build was needed.
+    """
+    global _source_mtimes
+    with _daemon_build_lock:
+        current = scan_source_mtimes()
+        targets = list(targets or [])
+        scanned = not targets and not since
+        if scanned:
+            targets = [node for node, mtime in current.items() if _source_mtimes.get(node) != mtime]
+            targets += [node for node in _source_mtimes if node not in current]
+        outputs = set()
+        if targets or since:
+            outputs = run_targeted_build(targets, since, template=get_template(),
+                                         image_catalog=get_image_catalog(refresh=True),
+                                         check_targets=not scanned)
+            if outputs is None:
+                run_build_blog()
+                run_update_placeholders()
+                run_build_service_worker()
+                save_build_graph()
+                outputs = {'*'}
+        # Snapshot after building so the daemon's own writes are not seen as edits
+        _source_mtimes = scan_source_mtimes()
+        return sorted(outputs)
+
+def make_request_handler():
+    """Build the daemon's request handler class (http.server is imported lazily)."""
+    import subprocess
+    import yaml
+    from http.server import BaseHTTPRequestHandler
+    
+    class BuildRequestHandler(BaseHTTPRequestHandler):
+        """Local HTTP API for the build daemon.
+
+        GET  /health                  -> {"status": "ok"}
+        GET  /preview/<post>.html     -> rendered post from blog/posts/<post>.md
+        POST /preview                 -> rendered post from the Markdown request body
+        POST /rebuild                 -> {"rebuilt": [...], "ms": ...}; optional JSON
+                                         body {"targets": [...], "since": "<rev>"}
+
+        Requests sent by a page from another origin get 403, and a /rebuild
+        body must be sent as application/json, so a web page open in the
+        developer's browser cannot drive the build.
+        """
+
+        def _send(self, status, body, content_type='application/json'):
+            if not isinstance(body, str):
+                body = json.dumps(body)
+            data = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _read_body(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            return self.rfile.read(length).decode('utf-8') if length else ''
+
+        def _handle(self, action):
+            """Run a request action: 400 for bad input, 500 for anything else."""
+            try:
+                action()
+            except (ValueError, yaml.YAMLError, subprocess.CalledProcessError) as e:
+                self._send(400, {'error': str(e)})
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                self._send(500, {'error': f"{type(e).__name__}: {e}"})
+
+        def _foreign_origin(self):
+            """Whether the request comes from a page not served by the daemon itself."""
+            origin = self.headers.get('Origin')
+            if origin is None:
+                return False
+            port = self.server.server_address[1]
+            return origin not in (f'http://{DAEMON_HOST}:{port}', f'http://localhost:{port}')
+
+        def do_GET(self):
+            if self._foreign_origin():
+                self._send(403, {'error': 'Cross-origin requests are not allowed'})
+                return
+            self._handle(self._get)
+
+        def do_POST(self):
+            if self._foreign_origin():
+                self._send(403, {'error': 'Cross-origin requests are not allowed'})
+                return
+            self._handle(self._post)
+
+        def _get(self):
+            path = self.path.split('?', 1)[0]
+            if path == '/health':
+                self._send(200, {'status': 'ok'})
+            elif path.startswith('/preview/') and path.endswith('.html'):
+                post = POSTS_DIR / (Path(path).stem + '.md')
+                if not post.exists():
+                    self._send(404, {'error': f'No post {post.name}'})
+                    return
+                self._send(200, render_post_preview(*get_post(post)), 'text/html')
+            else:
+                self._send(404, {'error': 'Not found'})
+
+        def _post(self):
+            path = self.path.split('?', 1)[0]
+            start = time.perf_counter()
+            if path == '/preview':
+                self._send(200, render_post_preview(*parse_post_text(self._read_body())), 'text/html')
+            elif path == '/rebuild':
+                content_type = self.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+                if content_type != 'application/json' and (content_type or self.headers.get('Content-Length', '0') != '0'):
+                    self._send(415, {'error': 'Request body must be sent as application/json'})
+                    return
+                body = self._read_body()
+                request = json.loads(body) if body else {}
+                if not isinstance(request, dict):
+                    raise ValueError("Request body must be a JSON object")
+                targets, since = request.get('targets'), request.get('since')
+                if targets is not None and not (isinstance(targets, list) and all(isinstance(t, str) for t in targets)):
+                    raise ValueError("'targets' must be a list of paths")
+                if since is not None and not isinstance(since, str):
+                    raise ValueError("'since' must be a git revision string")
+                rebuilt = daemon_rebuild(targets, since)
+                self._send(200, {'rebuilt': rebuilt, 'ms': round((time.perf_counter() - start) * 1000, 1)})
+            else:
+                self._send(404, {'error': 'Not found'})
+
+        def log_message(self, format, *args):
+            print(f"[daemon] {self.address_string()} {format % args}")
+    
+    return BuildRequestHandler
+
+def run_daemon(port=DAEMON_PORT):
+    """Serve the build API on localhost until interrupted."""
+    print("\n=== Build Daemon ===\n")
+    # Warm everything a request needs before accepting connections
+    global _source_mtimes
+    get_template()
+    get_image_catalog()
+    for filename in POSTS_DIR.glob('*.md'):
+        get_post(filename)
+    render_post_preview({}, '')
+    load_build_graph()
+    _source_mtimes = scan_source_mtimes()
+    
+    from http.server import ThreadingHTTPServer
+    
+    server = ThreadingHTTPServer((DAEMON_HOST, port), make_request_handler())
+    print(f"Listening on http://{DAEMON_HOST}:{port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping daemon")
+    finally:
+        server.server_close()
+
+# ==========================================
+# Checks
+# ==========================================
+
+def find_broken_references(image_catalog):
+    """Return a list of problems with local asset references in the site pages.
+
+    Reports images missing from the catalog (with did-you-mean suggestions),
+    placeholders that match no image, and missing css/js/font files.
+    """
+    problems = []
+    pages = sorted(SCRIPT_DIR.glob('*.html')) + sorted(BLOG_DIR.glob('*.html'))
+    for html_path in pages:
+        with open(html_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        name = node_name(html_path)
+        
+        for ref in dict.fromkeys(re.findall(r"""(?:src="|data-bg="|url\(['"]?)(?:\.\./)?imgs/([^"')]+)""", content)):
+            if ref not in image_catalog['images'] and '{{' not in ref:
+                _, suggestions = resolve_image(image_catalog, ref)
+                hint = f" (did you mean {', '.join(suggestions)}?)" if suggestions else ""
+                problems.append(f"{name}: missing image imgs/{ref}{hint}")
+        
+        for match in find_placeholders(content):
+            if resolve_image(image_catalog, match.group(1))[0] is None:
+                problems.append(f"{name}: placeholder '{match.group(1).strip()}' matches no image")
+        
+        # blog/template.html renders root pages, so its paths are root-relative
+        base_dir = html_path.parent if _page_flags(html_path)[0] else SCRIPT_DIR
+        for ref in dict.fromkeys(re.findall(r'(?:src|href)="((?:\.\./)?(?:css|js|fonts)/[^"]+)"', content)):
+            if not (base_dir / ref).exists():
+                problems.append(f"{name}: missing file {ref}")
+    return problems
+
+def run_check():
+    """Fast consistency check for git hooks and CI. Returns a process exit code."""
+    print("\n=== Checking Site ===\n")
+    image_catalog = get_image_catalog()
+    problems = find_broken_references(image_catalog)
+    
+    entries = collect_precache_entries(image_catalog)
+    blog_pages = {'blog.html'}
+    blog_pages.update(p.with_suffix('.html').name for p in POSTS_DIR.glob('*.md'))
+    output, _ = generate_service_worker(entries, blog_pages)
+    if not SERVICE_WORKER_FILE.exists() or SERVICE_WORKER_FILE.read_text(encoding='utf-8') != output:
+        problems.append(f"{SERVICE_WORKER_FILE.name} is out of date (run: python build.py sw)")
+    
+    for problem in problems:
+        print(f"  {problem}")
+    print(f"\n{len(problems)} problem(s) found" if problems else "No problems found")
+    return 1 if problems else 0
+
+# ==========================================
+# Main Execution
+# ==========================================
+
+def _parse_port(value):
+    port = int(value)
+    if not 0 < port < 65536:
+        raise ValueError(value)
+    return port
+
+def parse_options(args):
+    """Parse the flags shared by all commands. Remaining arguments are targets."""
+    options = {
+        'dry_run': '--dry-run' in args or '--diff' in args,
+        'diff': '--diff' in args,
+        'skip_common': '--skip-common' in args,
+        'stream': '--stream' in args,
+        'since': None,
+        'port': DAEMON_PORT,
+        'targets': [],
+    }
+    values = set()
+    for flag, key, convert in (('--since', 'since', str), ('--port', 'port', _parse_port)):
+        if flag in args:
+            index = args.index(flag) + 1
+            if index >= len(args):
+                print(f"Error: {flag} needs a value")
+                sys.exit(1)
+            try:
+                options[key] = convert(args[index])
+            except ValueError:
+                print(f"Error: invalid value for {flag}: '{args[index]}'")
+                sys.exit(1)
+            values.add(index)
+    options['targets'] = [arg for i, arg in enumerate(args) if not arg.startswith('--') and i not in values]
+    return options
+
+def run_dry(options, action):
+    """Run a command in memory and report which outputs it would change.
+
+    With --dry-run every writer goes to the virtual output layer, so the
+    blog, pages and sw.js stages see each other's results exactly as a real
+    build would, and nothing on disk is touched (not even .build_cache/). --diff also prints the
+    unified diffs.
+    """
+    print("=== DRY RUN MODE - No files will be modified ===\n")
+    with virtual_outputs() as outputs:
+        action()
+    print("\n=== Changes ===\n")
+    report_output_changes(outputs, options['diff'])
+
+def render_site(skip_common=False, stream=False):
+    """Run the full build in memory and return every output as {Path: content}.
+
+    Unchanged outputs are included; compare against disk to find changes.
+    """
+    with virtual_outputs() as outputs:
+        run_full_build(True, skip_common, stream)
+    return outputs
+
+def run_full_build(dry_run=False, skip_common=False, stream=False):
+    run_build_blog()
+
+    # Then update placeholders
+    run_update_placeholders(dry_run, skip_common, stream)
+    
+    # The precache revisions hash the final pages, so this runs last
+    run_build_service_worker(dry_run)
+    
+    # A full build records every edge, so the graph is rewritten from scratch
+    if not dry_run:
+        save_build_graph()
+
+def command_build(options):
+    dry_run = options['dry_run']
+    skip_common = options['skip_common']
+    stream = options['stream']
+    targets, since = options['targets'], options['since']
+    
+    def build():
+        # Named targets or --since rebuild only what depends on them
+        if (targets or since) and run_targeted_build(targets, since, dry_run, skip_common, stream) is not None:
+            return
+        run_full_build(dry_run, skip_common, stream)
+    
+    try:
+        if dry_run:
+            run_dry(options, build)
+        else:
+            build()
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    print("\n=== Build Complete ===")
+
+def command_blog(options):
+    if options['dry_run']:
+        run_dry(options, run_build_blog)
+    else:
+        run_build_blog()
+
+def command_pages(options):
+    action = lambda: run_update_placeholders(options['dry_run'], options['skip_common'], options['stream'])
+    if options['dry_run']:
+        run_dry(options, action)
+    else:
+        action()
+
+def command_images(options):
+    image_catalog = get_image_catalog(refresh=True)
+    for rel_name, entry in sorted(image_catalog['images'].items()):
+        size = f"{entry['width']}x{entry['height']}" if entry['width'] else "?"
+        print(f"  {rel_name:45} {entry['format']:5} {size:>11} {entry['size'] / 1024:9.1f} KB")
+    print(f"\n{len(image_catalog['images'])} images in {IMGS_DIR}")
+
+def command_sw(options):
+    if options['dry_run']:
+        run_dry(options, lambda: run_build_service_worker(True))
+    else:
+        run_build_service_worker()
+
+def command_check(options):
+    return run_check()
+
+def command_serve(options):
+    run_daemon(options['port'])
+
+def command_help(options):
+    print(__doc__.strip())
+    print("\nCommands:")
+    for name, (_, description) in COMMANDS.items():
+        print(f"    {name:8} {description}")
+
+COMMANDS = {
+    'build': (command_build, "full build, or <target>... / --since <rev> and dependents (default)"),
+    'blog': (command_blog, "render Markdown posts and blog.html"),
+    'pages': (command_pages, "update placeholders, headers/footers, partners and resource hints"),
+    'images': (command_images, "refresh and list the image catalog"),
+    'sw': (command_sw, "regenerate sw.js and its precache manifest"),
+    'check': (command_check, "report broken asset references and a stale sw.js (exit 1 on problems)"),
+    'serve': (command_serve, "run the build daemon (local HTTP API, --port N)"),
+    'help': (command_help, "show this help"),
+}
+
+def _is_target_argument(arg):
+    """is_known_target() for the command line: a path outside the site is an error."""
+    try:
+        return is_known_target(arg)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else list(argv)
+    command = 'build'
+    if args and args[0] in COMMANDS:
+        command = args.pop(0)
+    elif args and not args[0].startswith('-') and not _is_target_argument(args[0]):
+        # A mistyped command must not turn into a no-op targeted build
+        import difflib
+        print(f"Error: unknown command or target '{args[0]}'")
+        close = difflib.get_close_matches(args[0], list(COMMANDS), n=1)
+        if close:
+            print(f"Did you mean: {close[0]}?")
+        print("Run 'python build.py help' for the list of commands.")
+        sys.exit(1)
+    elif '--serve' in args:
+        command = 'serve'
+    elif '--help' in args or '-h' in args:
+        command = 'help'
+    
+    exit_code = COMMANDS[command][0](parse_options(args))
+    if exit_code:
+        sys.exit(exit_code)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+/* Generated by build.py - do not edit directly. */
+const PRECACHE_VERSION = 'f524db28f3bb';
+const PRECACHE = 'fm-precache';
+const RUNTIME = 'fm-runtime-' + PRECACHE_VERSION;
+const NETWORK_TIMEOUT_MS = 3000;
+
+const PRECACHE_MANIFEST = [
+    {
+        "url": "about.html",
+        "revision": "29785fd2d9eef838"
+    },
+    {
+        "url": "blog.html",
+        "revision": "a23112794ab756e8"
+    },
+    {
+        "url": "contact.html",
+        "revision": "9f75bb4eae3fe94d"
+    },
+    {
+        "url": "damage-analysis-radio-telescope.html",
+        "revision": "f672d92aa70f35c0"
+    },
+    {
+        "url": "fringescan.html",
+        "revision": "40deb7dc3ee8b80a"
+    },
+    {
+        "url": "fringeshot.html",
+        "revision": "2006e7c6994460b8"
+    },
+    {
+        "url": "hello.html",
+        "revision": "845b7de0dc869f9a"
+    },
+    {
+        "url": "index.html",
+        "revision": "57084f7281f9a37a"
+    },
+    {
+        "url": "ngvla-panel-manufacturing.html",
+        "revision": "abf0fd846b5a4a49"
+    },
+    {
+        "url": "privacy.html",
+        "revision": "ee31e1d8e0b343e5"
+    },
+    {
+        "url": "projection.html",
+        "revision": "5e2cf32c3ae25492"
+    },
+    {
+        "url": "root-cause-identification.html",
+        "revision": "33bec461050f4b99"
+    },
+    {
+        "url": "structured-light.html",
+        "revision": "be48b0f0708e2f55"
+    },
+    {
+        "url": "terms.html",
+        "revision": "ae1a9853f3ac28d3"
+    },
+    {
+        "url": "css/style.css",
+        "revision": "d67505921210df0d"
+    },
+    {
+        "url": "js/autocollimator-sla.js",
+        "revision": "d4ad2f88219d4580"
+    },
+    {
+        "url": "js/autocollimator-source.js",
+        "revision": "c4201dddc92dd847"
+    },
+    {
+        "url": "js/experiment-shared.js",
+        "revision": "ff9a5b3dc7e8dd04"
+    },
+    {
+        "url": "js/main.js",
+        "revision": "5f432e04ae9a0fc3"
+    },
+    {
+        "url": "js/slideshow.js",
+        "revision": "80d93c77142d837f"
+    },
+    {
+        "url": "imgs/color.png",
+        "revision": "52fd3ba083095157"
+    },
+    {
+        "url": "imgs/fringescan.gif",
+        "revision": "573877fe39ed5eec"
+    },
+    {
+        "url": "imgs/16mm_fringeshot.jpg",
+        "revision": "d2ca7f65662e7c0f"
+    },
+    {
+        "url": "imgs/fringescan_custom_systems.jpg",
+        "revision": "fa4f949c834ca082"
+    },
+    {
+        "url": "imgs/chips.png",
+        "revision": "35318c4d89094709"
+    }
+];
+
+const BLOG_PAGES = new Set(["blog.html", "damage-analysis-radio-telescope.html", "hello.html", "ngvla-panel-manufacturing.html", "root-cause-identification.html"]);
+
+const scopeUrl = (path) => new URL(path, self.registration.scope).href;
+const cacheKey = (entry) => scopeUrl(entry.url) + '?__rev=' + entry.revision;
+const precacheKeys = new Map(PRECACHE_MANIFEST.map(entry => [scopeUrl(entry.url), cacheKey(entry)]));
+
+self.addEventListener('install', (event) => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(PRECACHE);
+        await Promise.all(PRECACHE_MANIFEST.map(async (entry) => {
+            const key = cacheKey(entry);
+            if (await cache.match(key)) {
+                return;
+            }
+            const response = await fetch(scopeUrl(entry.url), { cache: 'reload' });
+            if (response.ok) {
+                await cache.put(key, response);
+            }
+        }));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', (event) => {
+    event.waitUntil((async () => {
+        // Drop precache revisions that are no longer in the manifest
+        const cache = await caches.open(PRECACHE);
+        const current = new Set(precacheKeys.values());
+        for (const request of await cache.keys()) {
+            if (!current.has(request.url)) {
+                await cache.delete(request);
+            }
+        }
+        // Pages cached by an older deploy may predate the new precache
+        for (const name of await caches.keys()) {
+            if (name.startsWith('fm-runtime-') && name !== RUNTIME) {
+                await caches.delete(name);
+            }
+        }
+        await self.clients.claim();
+    })());
+});
+
+function pageUrl(url) {
+    const page = new URL(url);
+    page.search = '';
+    page.hash = '';
+    if (page.href === self.registration.scope) {
+        page.href = scopeUrl('index.html');
+    }
+    return page.href;
+}
+
+async function cachedPage(url) {
+    const runtime = await caches.open(RUNTIME);
+    const cached = await runtime.match(url);
+    if (cached) {
+        return cached;
+    }
+    const key = precacheKeys.get(url);
+    return key ? (await caches.open(PRECACHE)).match(key) : undefined;
+}
+
+async function fetchAndCache(request, url) {
+    const response = await fetch(request);
+    if (response.ok) {
+        const runtime = await caches.open(RUNTIME);
+        await runtime.put(url, response.clone());
+    }
+    return response;
+}
+
+async function staleWhileRevalidate(event, url) {
+    const cached = await cachedPage(url);
+    const network = fetchAndCache(event.request, url);
+    if (cached) {
+        event.waitUntil(network.catch(() => undefined));
+        return cached;
+    }
+    return network;
+}
+
+async function networkFirst(event, url) {
+    const network = fetchAndCache(event.request, url);
+    const timeout = new Promise(resolve => setTimeout(resolve, NETWORK_TIMEOUT_MS));
+    try {
+        const response = await Promise.race([network, timeout]);
+        if (response) {
+            return response;
+        }
+    } catch (error) {
+        // Offline: fall through to the cache
+    }
+    const cached = await cachedPage(url);
+    if (cached) {
+        event.waitUntil(network.catch(() => undefined));
+        return cached;
+    }
+    return network;
+}
+
+async function cacheFirst(request, key) {
+    const cached = await (await caches.open(PRECACHE)).match(key);
+    return cached || fetch(request);
+}
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    if (request.method !== 'GET' || !request.url.startsWith(self.registration.scope)) {
+        return;
+    }
+    const url = pageUrl(request.url);
+    const page = url.slice(self.registration.scope.length);
+
+    if (request.mode === 'navigate' || page.endsWith('.html')) {
+        if (BLOG_PAGES.has(page)) {
+            event.respondWith(staleWhileRevalidate(event, url));
+        } else {
+            event.respondWith(networkFirst(event, url));
+        }
+    } else if (precacheKeys.has(url)) {
+        event.respondWith(cacheFirst(request, precacheKeys.get(url)));
+    }
+});
@@ -0,0 +1,157 @@
+"""
+test_images.py - Image header parsing and placeholder resolution.
+
+The JPEG, WebP and AVIF headers are built by hand so each parser branch is
+covered without binary fixtures.
+
+Usage:
+    python -m pytest tests
+"""
+
+import io
+import struct
+import sys
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPT_DIR))
+
+import site_build  # noqa: E402
+
+
+def jpeg(width, height, sof=0xC0):
+    """SOI, an APP0 segment, a DHT segment behind fill bytes, then a start-of-frame."""
+    app0 = b'\xff\xe0' + struct.pack('>H', 16) + b'JFIF\x00' + bytes(9)
+    dht = b'\xff\xff\xff\xc4' + struct.pack('>H', 6) + bytes(4)
+    frame = bytes([0xFF, sof]) + struct.pack('>HBHHB', 11, 8, height, width, 1) + bytes(3)
+    return b'\xff\xd8' + app0 + dht + frame + b'\xff\xd9'
+
+
+def riff_webp(chunk, payload):
+    body = b'WEBP' + chunk + struct.pack('<I', len(payload)) + payload
+    return b'RIFF' + struct.pack('<I', len(body)) + body
+
+
+def webp_lossy(width, height):
+    # Frame tag, start code, then 14-bit sizes (the top two bits hold the scale)
+    return riff_webp(b'VP8 ', bytes(3) + b'\x9d\x01\x2a' + struct.pack('<HH', width | 0x4000, height | 0x8000))
+
+
+def webp_lossless(width, height):
+    bits = (width - 1) | ((height - 1) << 14)
+    return riff_webp(b'VP8L', b'\x2f' + bits.to_bytes(4, 'little'))
+
+
+def webp_extended(width, height):
+    return riff_webp(b'VP8X', bytes(4) + (width - 1).to_bytes(3, 'little') + (height - 1).to_bytes(3, 'little'))
+
+
+def avif(width, height):
+    ftyp = struct.pack('>I', 20) + b'ftypavif' + bytes(4) + b'mif1'
+    ispe = struct.pack('>I', 20) + b'ispe' + bytes(4) + struct.pack('>II', width, height)
+    return ftyp + struct.pack('>I', 8 + len(ispe)) + b'meta' + ispe
+
+
+def png(width, height):
+    return b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' + struct.pack('>II', width, height) + bytes(5)
+
+
+def gif(width, height):
+    return b'GIF89a' + struct.pack('<HH', width, height) + bytes(3)
+
+
+def dimensions(data, suffix):
+    return site_build._read_image_dimensions(data, site_build._sniff_image_format(data, suffix))
+
+
+class ImageHeaderTest(unittest.TestCase):
+
+    def test_formats_are_sniffed_from_magic_bytes(self):
+        # The suffix is wrong on purpose; the content decides
+        cases = [(png(1, 1), 'png'), (gif(1, 1), 'gif'), (jpeg(1, 1), 'jpeg'),
+                 (webp_lossless(1, 1), 'webp'), (avif(1, 1), 'avif')]
+        for data, fmt in cases:
+            with self.subTest(fmt=fmt):
+                self.assertEqual(site_build._sniff_image_format(data, '.bin'), fmt)
+        self.assertEqual(site_build._sniff_image_format(b'<svg', '.SVG'), 'svg')
+        self.assertEqual(site_build._sniff_image_format(b'', '.jpg'), 'jpeg')
+
+    def test_jpeg(self):
+        self.assertEqual(dimensions(jpeg(1920, 1080), '.jpg'), (1920, 1080))
+        # Progressive frames are start-of-frame markers too
+        self.assertEqual(dimensions(jpeg(640, 480, sof=0xC2), '.jpg'), (640, 480))
+
+    def test_webp(self):
+        self.assertEqual(dimensions(webp_lossy(800, 600), '.webp'), (800, 600))
+        self.assertEqual(dimensions(webp_lossless(16383, 1), '.webp'), (16383, 1))
+        self.assertEqual(dimensions(webp_extended(20000, 300), '.webp'), (20000, 300))
+
+    def test_avif(self):
+        self.assertEqual(dimensions(avif(1200, 630), '.avif'), (1200, 630))
+
+    def test_png_gif_svg(self):
+        self.assertEqual(dimensions(png(300, 200), '.png'), (300, 200))
+        self.assertEqual(dimensions(gif(64, 32), '.gif'), (64, 32))
+        self.assertEqual(dimensions(b'<svg xmlns="x" width="120px" height="40">', '.svg'), (120, 40))
+        self.assertEqual(dimensions(b'<svg viewBox="0 0 24.5 12">', '.svg'), (24, 12))
+
+    def test_truncated_headers(self):
+        for data, suffix in [(jpeg(10, 10)[:20], '.jpg'), (webp_lossy(10, 10)[:28], '.webp'),
+                             (avif(10, 10)[:-4], '.avif'), (png(10, 10)[:18], '.png'), (b'', '.gif')]:
+            with self.subTest(suffix=suffix):
+                self.assertEqual(dimensions(data, suffix), (None, None))
+
+    def test_site_images(self):
+        with redirect_stdout(io.StringIO()), site_build.virtual_outputs():
+            catalog = site_build.load_image_catalog()
+        self.assertTrue(catalog['images'])
+        for name, entry in catalog['images'].items():
+            with self.subTest(image=name):
+                self.assertIsNotNone(entry['width'])
+                self.assertIsNotNone(entry['height'])
+
+
+class ResolveImageTest(unittest.TestCase):
+
+    def setUp(self):
+        images = ['logo_mtex.avif', 'logo_tech_launch_az.png', 'team/alice-smith.jpg', 'hero.png', 'sub/hero.png']
+        self.catalog = site_build._index_catalog(
+            {'images': {name: {'stem': Path(name).stem.lower()} for name in images}})
+
+    def resolve(self, text):
+        return site_build.resolve_image(self.catalog, text)
+
+    def test_exact_names_and_stems(self):
+        self.assertEqual(self.resolve('logo_mtex.avif'), ('logo_mtex.avif', []))
+        self.assertEqual(self.resolve(' LOGO_MTEX.AVIF '), ('logo_mtex.avif', []))
+        # Any extension, or none, names the same image
+        self.assertEqual(self.resolve('logo_mtex.png'), ('logo_mtex.avif', []))
+        self.assertEqual(self.resolve('logo_mtex'), ('logo_mtex.avif', []))
+        self.assertEqual(self.resolve('team/alice-smith'), ('team/alice-smith.jpg', []))
+
+    def test_top_level_image_wins(self):
+        self.assertEqual(self.resolve('hero'), ('hero.png', []))
+        self.assertEqual(self.resolve('sub/hero'), ('sub/hero.png', []))
+
+    def test_separator_insensitive(self):
+        self.assertEqual(self.resolve('Alice Smith'), ('team/alice-smith.jpg', []))
+
+    def test_fuzzy_matches_and_suggestions(self):
+        # A close miss resolves but is still reported
+        self.assertEqual(self.resolve('logo_tech_lanch_az'), ('logo_tech_launch_az.png', ['logo_tech_launch_az.png']))
+        # A distant one only produces suggestions
+        image, suggestions = self.resolve('logo_tech')
+        self.assertIsNone(image)
+        self.assertIn('logo_tech_launch_az.png', suggestions)
+        self.assertEqual(self.resolve('zzz'), (None, []))
+
+    def test_text_without_a_file_name(self):
+        for text in ['', '   ', '.', '/', './', '//']:
+            with self.subTest(text=text):
+                self.assertEqual(self.resolve(text), (None, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+test_streaming.py - The streaming page updater must match the whole-file path.
+
+Every page is updated both ways in memory (virtual_outputs()), at chunk sizes
+that split regions and markers at many different offsets.
+
+Usage:
+    python -m pytest tests
+"""
+
+import io
+import sys
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPT_DIR))
+
+import site_build  # noqa: E402
+
+CHUNK_SIZES = (7, 61, 1024, site_build.STREAM_CHUNK_SIZE)
+
+# A hero built from an image placeholder, which is only preloaded once the
+# placeholder has been resolved
+PLACEHOLDER_HERO_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <link rel="stylesheet" href="css/style.css">
+</head>
+<body>
+    <header></header>
+    <main>
+        <section class="hero">
+            <div class="image-placeholder">{image}</div>
+        </section>
+    </main>
+    <footer></footer>
+</body>
+</html>
+"""
+
+
+def update(html_path, catalog, chunk_size=None, update_common=True, content=None):
+    """Return the updated page, using the streaming path when chunk_size is given.
+
+    content, when given, stands in for the page in memory.
+    """
+    with redirect_stdout(io.StringIO()), site_build.virtual_outputs() as outputs:
+        if content is not None:
+            site_build.write_output(html_path, content)
+        if chunk_size is None:
+            site_build.update_html_file(html_path, catalog, update_common=update_common)
+        else:
+            site_build.stream_update_html_file(html_path, catalog, update_common=update_common,
+                                               chunk_size=chunk_size)
+        return outputs[html_path]
+
+
+class StreamingMatchesWholeFileTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Loaded in memory so the test never writes .build_cache/
+        with redirect_stdout(io.StringIO()), site_build.virtual_outputs():
+            cls.catalog = site_build.load_image_catalog()
+        cls.pages = sorted(SCRIPT_DIR.glob('*.html'))
+
+    def assert_modes_match(self, html_path, update_common=True, content=None):
+        expected = update(html_path, self.catalog, update_common=update_common, content=content)
+        for chunk_size in CHUNK_SIZES:
+            with self.subTest(page=html_path.name, chunk_size=chunk_size, update_common=update_common):
+                self.assertEqual(update(html_path, self.catalog, chunk_size, update_common, content), expected)
+        return expected
+
+    def test_site_pages(self):
+        self.assertTrue(self.pages)
+        for html_path in self.pages:
+            self.assert_modes_match(html_path)
+
+    def test_site_pages_skip_common(self):
+        for html_path in self.pages:
+            self.assert_modes_match(html_path, update_common=False)
+
+    def test_placeholder_hero(self):
+        image = sorted(self.catalog['images'])[0]
+        html_path = SCRIPT_DIR / 'streaming-test-page.html'
+        content = PLACEHOLDER_HERO_PAGE.format(image=Path(image).stem)
+        updated = self.assert_modes_match(html_path, content=content)
+        self.assertIn(f'<link rel="preload" href="imgs/{image}"', updated)
+        self.assertFalse(html_path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()